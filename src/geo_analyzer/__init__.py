@@ -1,6 +1,6 @@
 """GEO Analyzer domain layer implementing the MVP defined in the PRD."""
 
-from .analytics import AnalyticsTracker
+from .analytics import AnalyticsTracker, QueueConfig
 from .engine import GeoSimulationEngine
 from .errors import SensitiveContentError, ValidationError
 from .models import (
@@ -13,6 +13,7 @@ from .models import (
 
 __all__ = [
     "AnalyticsTracker",
+    "QueueConfig",
     "GeoSimulationEngine",
     "SensitiveContentError",
     "ValidationError",
@@ -1,34 +1,145 @@
 from __future__ import annotations
 
+import threading
+import time
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Any, Dict, List
+from itertools import repeat
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
 
 
-@dataclass
+@dataclass(slots=True)
 class AnalyticsEvent:
     name: str
     payload: Dict[str, Any] = field(default_factory=dict)
-    timestamp: datetime = field(
-        default_factory=lambda: datetime.now(tz=timezone.utc)
-    )
+    # Epoch seconds; converted to a datetime only on export.
+    timestamp: float = field(default_factory=time.time)
+
+    @property
+    def iso_timestamp(self) -> str:
+        return datetime.fromtimestamp(self.timestamp, tz=timezone.utc).isoformat()
+
+
+class AnalyticsBatch(NamedTuple):
+    """Column-oriented events drained from the tracker in one swap."""
+
+    names: List[str]
+    payloads: List[Dict[str, Any]]
+    timestamps: List[float]
+
+    def to_events(self) -> List[AnalyticsEvent]:
+        return [
+            AnalyticsEvent(name=name, payload=payload, timestamp=timestamp)
+            for name, payload, timestamp in zip(
+                self.names, self.payloads, self.timestamps
+            )
+        ]
+
+
+@dataclass
+class QueueConfig:
+    """Batching knobs for AnalyticsTracker.
+
+    `event_batch_size` and `flush_interval` only apply when a sink is attached.
+    `max_queue_size` is opt-in: with a sink it forces an early flush, without
+    one it bounds memory by dropping the oldest events. The default (None)
+    never drops, since a sink-less tracker is drained by its owner, e.g. the
+    engine embedding each run's events in the report.
+    """
+
+    event_batch_size: int = 15
+    flush_interval: float = 5.0
+    max_queue_size: Optional[int] = None
 
 
 class AnalyticsTracker:
     """Minimal in-memory tracker used to satisfy Section 5 requirements."""
 
-    def __init__(self) -> None:
-        self._events: List[AnalyticsEvent] = []
+    def __init__(
+        self,
+        config: QueueConfig | None = None,
+        *,
+        on_flush: Optional[Callable[[AnalyticsBatch], None]] = None,
+    ) -> None:
+        self.config = config or QueueConfig()
+        self.on_flush = on_flush
+        # Events are stored as parallel columns; AnalyticsEvent rows are only
+        # materialised for callers reading `events`.
+        self._names: List[str] = []
+        self._payloads: List[Dict[str, Any]] = []
+        self._timestamps: List[float] = []
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
 
     def track(self, name: str, payload: Dict[str, Any] | None = None) -> None:
         # PRD: Analytics – record funnel, industry, and share telemetry.
-        self._events.append(AnalyticsEvent(name=name, payload=payload or {}))
+        self.track_many([(name, payload)])
+
+    def track_many(self, events: Iterable[Tuple[str, Dict[str, Any] | None]]) -> None:
+        """Record several `(name, payload)` pairs under one lock acquisition."""
+        pairs = list(events)
+        if not pairs:
+            return
+        now = time.time()
+        with self._lock:
+            self._names.extend(name for name, _ in pairs)
+            self._payloads.extend(payload or {} for _, payload in pairs)
+            self._timestamps.extend(repeat(now, len(pairs)))
+            queued = len(self._names)
+            max_queue_size = self.config.max_queue_size
+            if self.on_flush is None:
+                overflow = queued - max_queue_size if max_queue_size is not None else 0
+                if overflow > 0:
+                    del self._names[:overflow]
+                    del self._payloads[:overflow]
+                    del self._timestamps[:overflow]
+                return
+            full = queued >= self.config.event_batch_size or (
+                max_queue_size is not None and queued >= max_queue_size
+            )
+            if not full and self._timer is None:
+                # Interval trigger, armed by the first event of each batch.
+                self._timer = threading.Timer(self.config.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if full:
+            self.flush()
+
+    def has_events(self) -> bool:
+        return bool(self._names)
+
+    def _drain(self) -> AnalyticsBatch:
+        with self._lock:
+            if not self._names:
+                return AnalyticsBatch([], [], [])
+            batch = AnalyticsBatch(self._names, self._payloads, self._timestamps)
+            self._names, self._payloads, self._timestamps = [], [], []
+            timer, self._timer = self._timer, None
+        if timer is not None:
+            timer.cancel()
+        if batch.names and self.on_flush is not None:
+            self.on_flush(batch)
+        return batch
+
+    def flush(self) -> AnalyticsBatch:
+        return self._drain()
+
+    def flush_payloads(self) -> List[Dict[str, Any]]:
+        """Drain queued events as the `{"event", "payload"}` dicts reports embed."""
+        batch = self._drain()
+        return [
+            {"event": name, "payload": payload}
+            for name, payload in zip(batch.names, batch.payloads)
+        ]
 
-    def flush(self) -> List[AnalyticsEvent]:
-        events = list(self._events)
-        self._events.clear()
-        return events
+    def close(self) -> None:
+        """Stop the interval timer and hand any remaining events to the sink."""
+        self._drain()
 
     @property
     def events(self) -> List[AnalyticsEvent]:
-        return list(self._events)
+        with self._lock:
+            batch = AnalyticsBatch(
+                list(self._names), list(self._payloads), list(self._timestamps)
+            )
+        return batch.to_events()
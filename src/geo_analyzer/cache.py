@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import heapq
+import math
+import re
+import threading
+import time
+from collections import Counter, OrderedDict, deque
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Protocol, Tuple
+
+from .models import DiagnosisRequest
+
+
+class CacheBackend(Protocol):
+    """Storage contract for LLMCache; swap in Redis et al. behind this."""
+
+    def get(self, key: str) -> Optional[Any]:
+        ...
+
+    def set(self, key: str, value: Any, *, ttl: Optional[float] = None) -> None:
+        ...
+
+    def delete(self, key: str) -> None:
+        ...
+
+
+class InMemoryLRU:
+    """Thread-safe LRU with optional per-entry TTL.
+
+    Expiry times also go into a min-heap so `sweep_expired` only touches
+    entries that have actually expired instead of scanning the whole map.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        *,
+        time_fn: Callable[[], float] = time.time,
+    ) -> None:
+        self.max_entries = max_entries
+        self._time_fn = time_fn
+        self._entries: "OrderedDict[str, Tuple[Optional[float], Any]]" = OrderedDict()
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= self._time_fn():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, *, ttl: Optional[float] = None) -> None:
+        now = self._time_fn()
+        expires_at = now + ttl if ttl is not None else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            if expires_at is not None:
+                heapq.heappush(self._expiry_heap, (expires_at, key))
+            self._sweep_expired(now)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            if len(self._expiry_heap) > 2 * self.max_entries:
+                # Overwrites and LRU evictions leave stale heap nodes behind.
+                self._expiry_heap = [
+                    (expires_at, key)
+                    for key, (expires_at, _) in self._entries.items()
+                    if expires_at is not None
+                ]
+                heapq.heapify(self._expiry_heap)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def sweep_expired(self) -> int:
+        """Drop expired entries; returns how many were removed."""
+        with self._lock:
+            return self._sweep_expired(self._time_fn())
+
+    def _sweep_expired(self, now: float) -> int:
+        removed = 0
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            expires_at, key = heapq.heappop(heap)
+            entry = self._entries.get(key)
+            # Skip heap nodes left behind by an overwrite of the key.
+            if entry is not None and entry[0] == expires_at:
+                del self._entries[key]
+                removed += 1
+        return removed
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Prompts mentioning "now" must always be answered live.
+_TIME_SENSITIVE_PATTERNS = (r"今天|现在|实时",)
+
+
+def _bigram_vector(text: str) -> Tuple[Counter, float]:
+    compact = "".join(text.split())
+    grams = Counter(compact[i : i + 2] for i in range(len(compact) - 1)) or Counter([compact])
+    return grams, math.sqrt(sum(count * count for count in grams.values()))
+
+
+class LLMCache:
+    """Exact + near-duplicate cache for orchestrator runs (PRD F-06 延迟优化).
+
+    The semantic tier compares character-bigram vectors of the normalised
+    description; company, product, industry and iterations must still match.
+    """
+
+    def __init__(
+        self,
+        backend: Optional[CacheBackend] = None,
+        *,
+        ttl: float = 3600,
+        similarity_threshold: Optional[float] = 0.95,
+        exclude_patterns: Iterable[str] = _TIME_SENSITIVE_PATTERNS,
+        max_semantic_entries: int = 256,
+    ) -> None:
+        self.backend: CacheBackend = backend or InMemoryLRU()
+        self.ttl = ttl
+        self.similarity_threshold = similarity_threshold
+        self._exclude = [re.compile(pattern) for pattern in exclude_patterns]
+        self._semantic: Deque[Tuple[str, Counter, float, str]] = deque(
+            maxlen=max_semantic_entries
+        )
+        self._semantic_lock = threading.Lock()
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0, "semantic_hits": 0}
+
+    @staticmethod
+    def key_for(request: DiagnosisRequest, iterations: int) -> str:
+        # The request digest is memoised, so repeat lookups skip the hashing.
+        return f"{request.cache_key}:{iterations}"
+
+    @staticmethod
+    def _scope_for(request: DiagnosisRequest, iterations: int) -> str:
+        return "|".join(
+            [request.company_name, request.product_name, request.industry.value, str(iterations)]
+        )
+
+    def _semantic_enabled(self, request: DiagnosisRequest) -> bool:
+        if self.similarity_threshold is None:
+            return False
+        description = request.normalized_description()
+        return not any(pattern.search(description) for pattern in self._exclude)
+
+    def _semantic_lookup(self, request: DiagnosisRequest, iterations: int) -> Optional[Any]:
+        scope = self._scope_for(request, iterations)
+        grams, norm = _bigram_vector(request.normalized_description())
+        with self._semantic_lock:
+            candidates = [
+                (entry_grams, entry_norm, key)
+                for entry_scope, entry_grams, entry_norm, key in reversed(self._semantic)
+                if entry_scope == scope
+            ]
+        for entry_grams, entry_norm, key in candidates:
+            dot = sum(count * entry_grams[gram] for gram, count in grams.items())
+            if norm and entry_norm and dot / (norm * entry_norm) >= self.similarity_threshold:
+                value = self.backend.get(key)
+                if value is not None:
+                    return value
+        return None
+
+    def lookup(self, request: DiagnosisRequest, iterations: int) -> Optional[Any]:
+        """Exact hit first, then the nearest cached reformulation."""
+        value = self.backend.get(self.key_for(request, iterations))
+        if value is None and self._semantic_enabled(request):
+            value = self._semantic_lookup(request, iterations)
+            if value is not None:
+                self.stats["semantic_hits"] += 1
+        self.stats["hits" if value is not None else "misses"] += 1
+        return value
+
+    def store(self, request: DiagnosisRequest, iterations: int, value: Any) -> None:
+        key = self.key_for(request, iterations)
+        self.backend.set(key, value, ttl=self.ttl)
+        if self._semantic_enabled(request):
+            grams, norm = _bigram_vector(request.normalized_description())
+            with self._semantic_lock:
+                if all(entry[3] != key for entry in self._semantic):
+                    self._semantic.append(
+                        (self._scope_for(request, iterations), grams, norm, key)
+                    )
@@ -0,0 +1,14 @@
+"""FastAPI dependencies shared by the API routes."""
+
+from __future__ import annotations
+
+from functools import lru_cache
+
+from .engine import GeoSimulationEngine
+
+
+@lru_cache(maxsize=1)
+def get_engine() -> GeoSimulationEngine:
+    # One engine per process, built on first use; tests swap it out through
+    # `app.dependency_overrides[get_engine]`.
+    return GeoSimulationEngine()
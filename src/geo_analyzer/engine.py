@@ -1,12 +1,29 @@
 from __future__ import annotations
 
+import random
 import re
 import threading
-from typing import Callable, Dict, List, Optional
-
-from .analytics import AnalyticsTracker
+import time
+import uuid
+from bisect import bisect_right
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from functools import lru_cache
+from itertools import accumulate, count
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .analytics import AnalyticsTracker, QueueConfig
+from .cache import LLMCache
 from .errors import SensitiveContentError
-from .llm import LLMObservation, LLMOrchestrator
+from .llm import (
+    MENTION_RE,
+    KeywordScanner,
+    LLMClientError,
+    LLMObservation,
+    LLMOrchestrator,
+    LLMRunResult,
+)
 from .logger import ProcessLogger
 from .models import (
     AdviceItem,
@@ -18,41 +35,138 @@ from .models import (
     SimulationSnapshot,
 )
 from .notifier import ReportUpdateNotifier
+from .resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    CircuitState,
+    ProviderHealth,
+    ProviderStats,
+)
+
+# Sentiment lexicons as (keyword, delta) pairs ordered by impact.
+_NEGATIVE_KEYWORDS: Tuple[Tuple[str, float], ...] = (
+    ("崩溃", 0.16),
+    ("bug", 0.15),
+    ("投诉", 0.12),
+    ("延迟", 0.1),
+    ("slow", 0.08),
+    ("昂贵", 0.07),
+    ("复杂", 0.05),
+)
+_POSITIVE_KEYWORDS: Tuple[Tuple[str, float], ...] = (
+    ("旗舰", 0.12),
+    ("领先", 0.1),
+    ("trusted", 0.09),
+    ("智能", 0.08),
+    ("高端", 0.07),
+    ("稳定", 0.05),
+)
+# PRD: F-04 – CTA tiers: crisis (SOV<15% or 负面>10%), growth (SOV<60%), defense.
+_CONVERSION_SOV_THRESHOLDS = (15.0, 60.0)
+_CONVERSION_TEMPLATES = (
+    ConversionCard(
+        mode="crisis",
+        title="您的品牌正在被 AI 遗忘",
+        body="您在 AI 里的存在感低于行业基准 40%。如不干预，市场将被竞品瓜分。",
+        cta="联系铭予：立即修复声誉",
+        tone_icon="🔴",
+    ),
+    ConversionCard(
+        mode="growth",
+        title="您错失了 40%+ 的精准流量",
+        body="您已进入视野，但排名被{competitor}压制。铭予 GEO 方案可帮您跃升至 Top 3。",
+        cta="联系铭予：获取增长方案",
+        tone_icon="⚡️",
+    ),
+    ConversionCard(
+        mode="defense",
+        title="表现卓越，但需警惕追兵",
+        body="新锐竞品正在通过 GEO 试图取代您的位置。铭予帮您建立数据护城河。",
+        cta="联系铭予：巩固领袖地位",
+        tone_icon="🛡️",
+    ),
+)
+# PRD: F-05 – advice copy; the industry label is baked into the SOV template
+# once per Industry so only the product name is formatted per request.
+_LOW_SOV_ADVICE: Dict[Industry, str] = {
+    industry: f"建议增加‘{{product}} + {industry.display_label}场景’的高权重语料投喂，强化实体关联。"
+    for industry in Industry
+}
+_HIGH_SOV_ADVICE = "{product} 的声量高于行业均值，请继续用案例夯实语义锚点。"
+_NEGATIVE_TAG_ADVICE = "检测到‘{tag}’标签。建议针对性发布技术解析文章进行语义清洗。"
+_STEADY_SENTIMENT_ADVICE = "保持积极口碑，并定期同步 Roadmap，防止旧反馈被放大。"
+_COMPETITOR_ADVICE = "建议在语料中强调与{competitor}的差异化功能，建立独特性神经元连接。"
+_NO_COMPETITOR_ADVICE = "建议持续监测新竞品，并将差异化卖点固化到 Prompt。"
+
+_INDUSTRY_COMPETITORS: Dict[Industry, List[str]] = {
+    Industry.SAAS: ["OptiStack", "DataPulse", "NeuronSuite"],
+    Industry.CONSUMER_ELECTRONICS: ["NovaWave", "ArcLight", "PulseOne"],
+    Industry.FINANCE: ["FinPulse", "LedgerX", "CrestPay"],
+    Industry.EDUCATION: ["LearnSphere", "EduNova", "MindBridge"],
+    Industry.OTHER: ["OmniLab", "PrimeSphere", "TerraBeam"],
+}
+# Industry default used when a description names no competitor.
+_FIRST_COMPETITOR: Dict[Industry, str] = {
+    industry: names[0] for industry, names in _INDUSTRY_COMPETITORS.items() if names
+}
+
+# Log labels indexed by bool (False -> 0, True -> 1) to avoid per-row branches.
+_OBSERVATION_STATUS = ("Success", "Cache")
+_COVERAGE_STATE = ("不可用", "在线")
+
+# Test inputs that force the E-01 degrade path, matched in one pass.
+_FORCED_DEGRADE_RE = re.compile("|".join(map(re.escape, ("timeout", "熔断"))))
+
+
+def _aggregate_outcomes(
+    recommended: Sequence[bool], negative: Sequence[bool]
+) -> Tuple[int, int, List[SimulationSnapshot]]:
+    """Count recommended/negative runs and sample a snapshot every 5 runs (F-03)."""
+    recommended_prefix = list(accumulate(recommended, initial=0))
+    negative_prefix = list(accumulate(negative, initial=0))
+    snapshots = [
+        SimulationSnapshot(
+            iteration=runs,
+            sov_progress=round((recommended_prefix[runs] / runs) * 100, 2),
+            negative_rate=round((negative_prefix[runs] / runs) * 100, 2),
+        )
+        for runs in range(5, len(recommended) + 1, 5)
+    ]
+    return recommended_prefix[-1], negative_prefix[-1], snapshots
+
+
+@lru_cache(maxsize=128)
+def _estimation_snapshots(
+    sov: float, negative_rate: float, iterations: int
+) -> Tuple[SimulationSnapshot, ...]:
+    """Flat E-01 progress curve; frozen snapshots are safe to share across reports."""
+    return tuple(
+        SimulationSnapshot(iteration=i * 5, sov_progress=sov, negative_rate=negative_rate)
+        for i in range(1, 1 + iterations // 5)
+    )
+
+
+@lru_cache(maxsize=32)
+def _keyword_scanner(
+    positive: Tuple[Tuple[str, float], ...], negative: Tuple[Tuple[str, float], ...]
+) -> KeywordScanner:
+    """One scanner per lexicon pair, shared by every default orchestrator using it."""
+    return KeywordScanner(positive, negative)
 
 
 class GeoSimulationEngine:
     """High-level orchestrator fulfilling PRD F-01 ~ F-06 + E-01/E-02."""
 
-    _NEGATIVE_KEYWORDS = {
-        "bug": 0.15,
-        "投诉": 0.12,
-        "延迟": 0.1,
-        "slow": 0.08,
-        "昂贵": 0.07,
-        "复杂": 0.05,
-        "崩溃": 0.16,
-    }
-    _POSITIVE_KEYWORDS = {
-        "旗舰": 0.12,
-        "智能": 0.08,
-        "高端": 0.07,
-        "领先": 0.1,
-        "trusted": 0.09,
-        "稳定": 0.05,
-    }
+    _NEGATIVE_KEYWORDS = _NEGATIVE_KEYWORDS
+    _POSITIVE_KEYWORDS = _POSITIVE_KEYWORDS
     _NEGATIVE_TAG_PHRASES = [
         "性价比高",
         "界面复杂",
         "稳定性波动",
         "客服响应慢",
     ]
-    _INDUSTRY_COMPETITORS: Dict[Industry, List[str]] = {
-        Industry.SAAS: ["OptiStack", "DataPulse", "NeuronSuite"],
-        Industry.CONSUMER_ELECTRONICS: ["NovaWave", "ArcLight", "PulseOne"],
-        Industry.FINANCE: ["FinPulse", "LedgerX", "CrestPay"],
-        Industry.EDUCATION: ["LearnSphere", "EduNova", "MindBridge"],
-        Industry.OTHER: ["OmniLab", "PrimeSphere", "TerraBeam"],
-    }
+    _RETRY_BACKOFF_CAP = 30.0
+    _INDUSTRY_COMPETITORS = _INDUSTRY_COMPETITORS
 
     def __init__(
         self,
@@ -60,76 +174,143 @@ class GeoSimulationEngine:
         iterations: int = 20,
         logger: ProcessLogger | None = None,
         tracker: AnalyticsTracker | None = None,
-        orchestrator: LLMOrchestrator | None = None,
+        refresh_tracker: AnalyticsTracker | None = None,
+        orchestrator: Union[LLMOrchestrator, Sequence[LLMOrchestrator], None] = None,
         email_notifier: ReportUpdateNotifier | None = None,
         retry_executor: Optional[Callable[[Callable[[], None]], None]] = None,
+        llm_cache: LLMCache | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        provider_timeouts: Optional[Sequence[Optional[float]]] = None,
+        refresh_attempts: int = 4,
+        retry_sleep: Callable[[float], None] = time.sleep,
     ) -> None:
         self.iterations = iterations
         self.logger = logger or ProcessLogger()
         self.tracker = tracker or AnalyticsTracker()
-        self.email_notifier = email_notifier or ReportUpdateNotifier()
-        self.retry_executor = retry_executor or self._default_retry_executor
-        self.orchestrator = orchestrator or LLMOrchestrator(
-            industry_competitors=self._INDUSTRY_COMPETITORS,
-            positive_keywords=self._POSITIVE_KEYWORDS,
-            negative_keywords=self._NEGATIVE_KEYWORDS,
-            negative_tags=self._NEGATIVE_TAG_PHRASES,
+        # Background refreshes and bulkhead rejects belong to no request, so
+        # they are kept out of the tracker whose events run() embeds in reports.
+        self.refresh_tracker = refresh_tracker or AnalyticsTracker(
+            QueueConfig(max_queue_size=1_000)
         )
-        self._version_store: Dict[str, int] = {}
-        self._pending_retry_keys: set[str] = set()
-        self._version_lock = threading.Lock()
+        self.email_notifier = email_notifier or ReportUpdateNotifier()
+        # Bulkhead: refreshes share a small pool and a bounded backlog.
+        self._retry_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="geo-retry")
+        self._retry_slots = threading.BoundedSemaphore(16)
+        self._io_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="geo-io")
+        self.retry_executor = retry_executor or self._retry_pool.submit
+        self.refresh_attempts = refresh_attempts
+        self.retry_sleep = retry_sleep
+        self.llm_cache = llm_cache or LLMCache()
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        if self.circuit_breaker.on_state_change is None:
+            self.circuit_breaker.on_state_change = self._track_circuit_state
+        if isinstance(orchestrator, Sequence):
+            self.orchestrators = list(orchestrator)
+        else:
+            self.orchestrators = [
+                orchestrator
+                or LLMOrchestrator(
+                    industry_competitors=self._INDUSTRY_COMPETITORS,
+                    positive_keywords=self._POSITIVE_KEYWORDS,
+                    negative_keywords=self._NEGATIVE_KEYWORDS,
+                    negative_tags=self._NEGATIVE_TAG_PHRASES,
+                    # Keyed on the engine's own lexicons so subclass
+                    # overrides get a matching scanner.
+                    keyword_scanner=_keyword_scanner(
+                        tuple(dict(self._POSITIVE_KEYWORDS).items()),
+                        tuple(dict(self._NEGATIVE_KEYWORDS).items()),
+                    ),
+                )
+            ]
+        # The primary keeps serving trace lookups (/trace/{task_id}).
+        self.orchestrator = self.orchestrators[0]
+        self.provider_timeouts = list(provider_timeouts or [None] * len(self.orchestrators))
+        if len(self.provider_timeouts) != len(self.orchestrators):
+            raise ValueError(
+                f"provider_timeouts has {len(self.provider_timeouts)} entries "
+                f"for {len(self.orchestrators)} orchestrators"
+            )
+        self._provider_health = [ProviderHealth() for _ in self.orchestrators]
+        self._provider_stats = [ProviderStats() for _ in self.orchestrators]
+        # Threads are only spawned once a call actually runs under a deadline.
+        self._timeout_executor = ThreadPoolExecutor(thread_name_prefix="geo-llm")
+        # next() on an itertools.count is atomic, so bumps need no lock.
+        self._version_counters: Dict[str, Iterator[int]] = {}
+        # retry key -> owner token; claimed with an atomic dict.setdefault.
+        self._pending_retry_keys: Dict[str, object] = {}
+        self._version_store_lock = threading.Lock()
+        self._closed = False
 
     def run(self, request: DiagnosisRequest) -> DiagnosticReport:
+        if self._closed:
+            raise RuntimeError("GeoSimulationEngine has been shut down")
         request.validate()
         benchmark_copy = self.industry_benchmark_copy(request.industry)
         # PRD: Analytics – funnel + industry coverage tracking.
-        self.tracker.track(
-            "funnel_visit",
-            {
-                "industry": request.industry.value,
-                "company": request.company_name,
-            },
-        )
-        self.tracker.track(
-            "form_submitted",
-            {
-                "industry": request.industry.value,
-                "product": request.product_name,
-            },
-        )
-        self.tracker.track(
-            "industry_distribution",
-            {"industry": request.industry.value, "benchmark": benchmark_copy},
-        )
-        self.tracker.track(
-            "wait_stage_started",
-            {"iterations_per_platform": self.iterations},
-        )
-
-        metrics, task_id = self._run_simulation(request, log=self.logger)
+        funnel_events = [
+            (
+                "funnel_visit",
+                {
+                    "industry": request.industry.value,
+                    "company": request.company_name,
+                },
+            ),
+            (
+                "form_submitted",
+                {
+                    "industry": request.industry.value,
+                    "product": request.product_name,
+                },
+            ),
+            (
+                "industry_distribution",
+                {"industry": request.industry.value, "benchmark": benchmark_copy},
+            ),
+            (
+                "wait_stage_started",
+                {"iterations_per_platform": self.iterations},
+            ),
+        ]
+        pre_track = None
+        if self.tracker.on_flush is None:
+            # Sink-less: a list extend under the lock, cheaper than a thread
+            # hop, and the funnel stays ahead of in-simulation events.
+            self.tracker.track_many(funnel_events)
+        else:
+            # These events do not depend on the simulation, so the sink flush
+            # overlaps the LLM fan-out.
+            pre_track = self._io_executor.submit(self.tracker.track_many, funnel_events)
+        try:
+            metrics, task_id = self._run_simulation(request, log=self.logger)
+        finally:
+            # Join before the report events are tracked and the queue drained.
+            if pre_track is not None:
+                pre_track.result()
 
         conversion_card = self._build_conversion_card(metrics, request)
         advices = self._build_advices(metrics, request)
-        self.tracker.track(
-            "cta_rendered",
-            {"mode": conversion_card.mode, "sov": metrics.sov_percentage},
-        )
-        self.tracker.track(
-            "report_ready",
-            {
-                "negative_rate": metrics.negative_rate,
-                "competitors": list(metrics.competitors.keys()),
-            },
-        )
-        self.tracker.track(
-            "report_share_enabled",
-            {"coverage": metrics.coverage},
+        self.tracker.track_many(
+            [
+                (
+                    "cta_rendered",
+                    {"mode": conversion_card.mode, "sov": metrics.sov_percentage},
+                ),
+                (
+                    "report_ready",
+                    {
+                        "negative_rate": metrics.negative_rate,
+                        "competitors": tuple(metrics.competitors),
+                    },
+                ),
+                (
+                    "report_share_enabled",
+                    {"coverage": metrics.coverage},
+                ),
+            ]
         )
 
-        analytics_payload = [
-            {"event": event.name, "payload": event.payload}
-            for event in self.tracker.flush()
-        ]
+        # A sink may already have drained this run's events.
+        analytics_payload = self.tracker.flush_payloads() if self.tracker.has_events() else []
         version = self._next_report_version(request)
         report = DiagnosticReport(
             request=request,
@@ -149,7 +330,22 @@ class GeoSimulationEngine:
             )
         return report
 
-    def industry_benchmark_copy(self, industry: Industry) -> str:
+    def shutdown(self) -> None:
+        """Flush buffered telemetry before the process exits."""
+        self._closed = True
+        self._io_executor.shutdown(wait=True)
+        self._timeout_executor.shutdown(wait=False)
+        self._retry_pool.shutdown(wait=False)
+        for orchestrator in self.orchestrators:
+            close = getattr(orchestrator, "shutdown", None)
+            if close is not None:
+                close()
+        self.tracker.close()
+        self.refresh_tracker.close()
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def industry_benchmark_copy(industry: Industry) -> str:
         return f"该行业平均 AI 推荐率为 {industry.benchmark_rate}%"
 
     def _generate_industry_estimation(
@@ -168,14 +364,7 @@ class GeoSimulationEngine:
         sov = request.industry.benchmark_rate
         recommendation_count = round(self.iterations * sov / 100)
         negative_rate = 8.0
-        snapshots = [
-            SimulationSnapshot(
-                iteration=i * 5,
-                sov_progress=sov,
-                negative_rate=negative_rate,
-            )
-            for i in range(1, 1 + self.iterations // 5)
-        ]
+        snapshots = list(_estimation_snapshots(sov, negative_rate, self.iterations))
         return SimulationMetrics(
             sov_percentage=float(sov),
             recommendation_count=recommendation_count,
@@ -189,20 +378,149 @@ class GeoSimulationEngine:
             snapshots=snapshots,
         )
 
+    @staticmethod
+    def _should_use_industry_estimation(request: DiagnosisRequest) -> bool:
+        return _FORCED_DEGRADE_RE.search(request.normalized_description()) is not None
+
+    def _guarded_simulate(
+        self, request: DiagnosisRequest, tracker: Optional[AnalyticsTracker] = None
+    ) -> Tuple[LLMOrchestrator, LLMRunResult]:
+        return self.circuit_breaker.call(
+            lambda: self._simulate_with_fallback(request, tracker or self.tracker),
+            is_failure=lambda outcome: outcome[1].degraded,
+            ignore=(SensitiveContentError,),
+        )
+
+    def _call_provider(
+        self,
+        position: int,
+        orchestrator: LLMOrchestrator,
+        request: DiagnosisRequest,
+        tracker: AnalyticsTracker,
+    ) -> LLMRunResult:
+        stats = self._provider_stats[position]
+        # An explicit timeout wins; otherwise use the p95-derived one once warm,
+        # but only while a later provider can still take over the request.
+        timeout = self.provider_timeouts[position]
+        if timeout is None and position < len(self.orchestrators) - 1:
+            timeout = stats.timeout
+        started = time.perf_counter()
+        try:
+            if timeout is None:
+                llm_result = orchestrator.simulate(request, iterations=self.iterations)
+            else:
+                future = self._timeout_executor.submit(
+                    orchestrator.simulate, request, iterations=self.iterations
+                )
+                # A timed-out call keeps running in its worker; its result is dropped.
+                llm_result = future.result(timeout=timeout)
+        finally:
+            recomputed = stats.record(time.perf_counter() - started)
+            if recomputed:
+                tracker.track(
+                    "provider_latency",
+                    {
+                        "provider": type(orchestrator).__name__,
+                        "position": position,
+                        "p50": stats.percentile(50),
+                        "p99": stats.percentile(99),
+                        "timeout": stats.timeout,
+                    },
+                )
+        return llm_result
+
+    def _simulate_with_fallback(
+        self, request: DiagnosisRequest, tracker: AnalyticsTracker
+    ) -> Tuple[LLMOrchestrator, LLMRunResult]:
+        """Try providers in order; only an exhausted chain degrades to E-01."""
+        last_outcome: Optional[Tuple[LLMOrchestrator, LLMRunResult]] = None
+        last_position = len(self.orchestrators) - 1
+        for position, orchestrator in enumerate(self.orchestrators):
+            health = self._provider_health[position]
+            # The last provider is always tried so the chain is never empty.
+            if position < last_position and not health.healthy:
+                continue
+            if position:
+                tracker.track("fallback_triggered", {"position": position})
+            try:
+                llm_result = self._call_provider(position, orchestrator, request, tracker)
+            except (TimeoutError, ConnectionError, LLMClientError):
+                health.record(False)
+                continue
+            if llm_result.degraded:
+                health.record(False)
+                last_outcome = (orchestrator, llm_result)
+                continue
+            health.record(True)
+            if position:
+                tracker.track("fallback_success", {"position": position})
+            return orchestrator, llm_result
+        if last_outcome is not None:
+            return last_outcome
+        return self.orchestrator, LLMRunResult(
+            task_id=str(uuid.uuid4()),
+            observations=[],
+            coverage={"doubao": False, "deepseek": False},
+            cache_note=None,
+            degraded=True,
+        )
+
+    def _track_circuit_state(self, previous: CircuitState, current: CircuitState) -> None:
+        self.tracker.track(
+            "circuit_state", {"from": previous.value, "to": current.value}
+        )
+
+    @staticmethod
+    def _detached_run(llm_result: LLMRunResult, **changes: Any) -> LLMRunResult:
+        """Copy whose containers are not shared, so reports and the cache never alias."""
+        return replace(
+            llm_result,
+            observations=list(llm_result.observations),
+            coverage=dict(llm_result.coverage),
+            **changes,
+        )
+
+    @staticmethod
+    def _is_cacheable(llm_result: LLMRunResult) -> bool:
+        # Only fully live results; cache-backed or degraded runs must be retried.
+        return not (
+            llm_result.cache_note or llm_result.degraded or not llm_result.observations
+        )
+
     def _run_simulation(
         self, request: DiagnosisRequest, log: Optional[ProcessLogger] = None
     ) -> tuple[SimulationMetrics, str]:
-        llm_result = self.orchestrator.simulate(request, iterations=self.iterations)
-        normalized_description = request.product_description.lower()
-        if "timeout" in normalized_description or "熔断" in request.product_description:
+        forced_degrade = self._should_use_industry_estimation(request)
+        # Never cache the forced E-01 path.
+        llm_result = None if forced_degrade else self.llm_cache.lookup(request, self.iterations)
+        active_logger = log or self.logger
+        source = self.orchestrator
+        if llm_result is not None:
+            # A hit is still a new task: fresh id and queue entry.
+            register = getattr(source, "register_task", None)
+            task_id = register() if register is not None else str(uuid.uuid4())
+            llm_result = self._detached_run(llm_result, task_id=task_id)
+        else:
+            try:
+                source, llm_result = self._guarded_simulate(request)
+            except CircuitOpenError:
+                # PRD: E-01 – breaker open: skip the live fan-out entirely.
+                if active_logger:
+                    active_logger.log("System", "LLM 熔断器已开启，直接使用 E-01 行业估算")
+                task_id = str(uuid.uuid4())
+                metrics = self._generate_industry_estimation(request, log=active_logger)
+                self._record_trace_summary(task_id, metrics)
+                return metrics, task_id
+            if not forced_degrade and self._is_cacheable(llm_result):
+                self.llm_cache.store(request, self.iterations, self._detached_run(llm_result))
+        if forced_degrade:
             # PRD: E-01 – allow测试输入强制模拟熔断场景.
             llm_result.degraded = True
             llm_result.observations = []
-        active_logger = log or self.logger
         if active_logger:
             active_logger.log("System", f"实时任务 {llm_result.task_id} 已创建")
         for platform, covered in llm_result.coverage.items():
-            state = "在线" if covered else "不可用"
+            state = _COVERAGE_STATE[covered]
             if active_logger:
                 active_logger.log(
                     "System",
@@ -223,7 +541,7 @@ class GeoSimulationEngine:
                 cache_note=llm_result.cache_note,
                 log=active_logger,
             )
-            self._record_trace_summary(llm_result.task_id, metrics)
+            self._record_trace_summary(llm_result.task_id, metrics, source)
             return metrics, llm_result.task_id
         metrics = self._build_metrics_from_observations(
             llm_result.observations,
@@ -234,7 +552,7 @@ class GeoSimulationEngine:
         )
         metrics.coverage = llm_result.coverage
         metrics.cache_note = llm_result.cache_note
-        self._record_trace_summary(llm_result.task_id, metrics)
+        self._record_trace_summary(llm_result.task_id, metrics, source)
         return metrics, llm_result.task_id
 
     def _build_metrics_from_observations(
@@ -246,71 +564,33 @@ class GeoSimulationEngine:
         coverage: Dict[str, bool],
         logger: Optional[ProcessLogger] = None,
     ) -> SimulationMetrics:
-        competitor_counts: Dict[str, int] = {}
-        negative_tags: List[str] = []
-        snapshots: List[SimulationSnapshot] = []
-        recommendation_totals: Dict[str, int] = {}
-        platform_runs: Dict[str, int] = {}
-        recommendation_count = 0
-        negative_count = 0
-
-        for idx, observation in enumerate(observations):
-            platform_key = getattr(observation, "platform_key", "")
-            if platform_key:
-                platform_runs[platform_key] = platform_runs.get(platform_key, 0) + 1
-            provider = observation.platform
-            status = "Cache" if observation.cached else "Success"
-            # PRD: F-03 – emit pseudo console logs for progress体验.
-            if logger:
-                logger.log(
-                    "System",
-                    f"正在连接 {provider} 知识库... {status}",
-                )
-            if observation.recommended:
-                recommendation_count += 1
-                recommendation_totals[platform_key] = recommendation_totals.get(platform_key, 0) + 1
-                if logger:
-                    logger.log(
-                        "Engine",
-                        f"{provider} 推荐 {request.product_name}",
-                    )
-            else:
-                competitor = observation.competitor or self._fallback_competitor(request)
-                if competitor:
-                    competitor_counts[competitor] = competitor_counts.get(competitor, 0) + 1
-                    if logger:
-                        logger.log(
-                            "Engine",
-                            f"{provider} 更倾向 {competitor}",
-                        )
-            if observation.sentiment < 0:
-                negative_count += 1
-            tag = observation.tag or "体验顺畅"
-            negative_tags.append(tag)
-            if logger:
-                logger.log(
-                    "Analysis",
-                    f'监测到关键词: "{tag}"',
-                )
-            if (idx + 1) % 5 == 0:
-                sov_progress = (recommendation_count / (idx + 1)) * 100
-                negative_rate_progress = (negative_count / (idx + 1)) * 100
-                snapshots.append(
-                    SimulationSnapshot(
-                        iteration=idx + 1,
-                        sov_progress=round(sov_progress, 2),
-                        negative_rate=round(negative_rate_progress, 2),
-                    )
-                )
+        negative_tags = [observation.tag or "体验顺畅" for observation in observations]
+        recommendation_total, negative_count, snapshots = _aggregate_outcomes(
+            [observation.recommended for observation in observations],
+            [observation.sentiment < 0 for observation in observations],
+        )
+        # The fallback only depends on the request, so resolve it once per run.
+        fallback_competitor = self._fallback_competitor(request)
+        preferred = [
+            None if observation.recommended else observation.competitor or fallback_competitor
+            for observation in observations
+        ]
+        # Counter keeps first-seen order, matching the previous dict upserts.
+        competitor_counts = Counter(competitor for competitor in preferred if competitor)
+        # most_common(1) breaks ties by first-seen order, like max() did.
+        top_competitor = competitor_counts.most_common(1)[0][0] if competitor_counts else None
+        platform_count = len(
+            {getattr(observation, "platform_key", "") for observation in observations} - {""}
+        )
+        if logger is not None:
+            self._log_observations(logger, observations, preferred, negative_tags, request)
 
         total_runs = max(1, len(observations))
         negative_rate = round((negative_count / total_runs) * 100, 2)
         active_platforms = sum(1 for key, covered in coverage.items() if covered)
         if not active_platforms:
-            active_platforms = max(1, len(platform_runs))
-        average_recommendations = round(
-            sum(recommendation_totals.values()) / max(1, active_platforms)
-        )
+            active_platforms = max(1, platform_count)
+        average_recommendations = round(recommendation_total / max(1, active_platforms))
         # PRD: F-02 – SOV = 推荐次数 / 20 * 100% (per-platform average).
         sov_percentage = round(
             (average_recommendations / max(1, per_platform_runs)) * 100,
@@ -323,10 +603,45 @@ class GeoSimulationEngine:
             negative_tags=negative_tags or ["体验顺畅"],
             competitors=competitor_counts,
             snapshots=snapshots,
+            top_competitor=top_competitor,
         )
 
-    def _record_trace_summary(self, task_id: str, metrics: SimulationMetrics) -> None:
-        trace_store = getattr(self.orchestrator, "trace_store", None)
+    @staticmethod
+    def _log_observations(
+        logger: ProcessLogger,
+        observations: Sequence[LLMObservation],
+        preferred: Sequence[Optional[str]],
+        negative_tags: Sequence[str],
+        request: DiagnosisRequest,
+    ) -> None:
+        # PRD: F-03 – emit pseudo console logs for progress体验.
+        pending: List[Tuple[str, str, Tuple[str, ...]]] = []
+        # Only platforms x cached/live distinct connect lines exist per run.
+        connect_lines: Dict[Tuple[str, bool], str] = {}
+        for observation, competitor, tag in zip(observations, preferred, negative_tags):
+            provider = observation.platform
+            connect = connect_lines.get((provider, observation.cached))
+            if connect is None:
+                status = _OBSERVATION_STATUS[observation.cached]
+                connect = connect_lines[(provider, observation.cached)] = (
+                    f"正在连接 {provider} 知识库... {status}"
+                )
+            pending.append(("System", connect, ()))
+            if observation.recommended:
+                pending.append(("Engine", "%s 推荐 %s", (provider, request.product_name)))
+            elif competitor:
+                pending.append(("Engine", "%s 更倾向 %s", (provider, competitor)))
+            pending.append(("Analysis", '监测到关键词: "%s"', (tag,)))
+        logger.log_many(pending)
+
+    def _record_trace_summary(
+        self,
+        task_id: str,
+        metrics: SimulationMetrics,
+        orchestrator: Optional[LLMOrchestrator] = None,
+    ) -> None:
+        # Summaries sit next to the raw traces of the provider that ran.
+        trace_store = getattr(orchestrator or self.orchestrator, "trace_store", None)
         if not trace_store:
             return
         trace_store.record_summary(
@@ -348,11 +663,19 @@ class GeoSimulationEngine:
         benchmark_copy: str,
     ) -> None:
         # PRD: F-06.6 – 命中缓存时需离线补数并邮件同步最新版本.
+        if self._closed:
+            # The retry pool is gone; the refresh is best-effort anyway.
+            return
         retry_key = self._version_key(request)
-        with self._version_lock:
-            if retry_key in self._pending_retry_keys:
-                return
-            self._pending_retry_keys.add(retry_key)
+        owner = object()
+        if self._pending_retry_keys.setdefault(retry_key, owner) is not owner:
+            return
+        if not self._retry_slots.acquire(blocking=False):
+            self._pending_retry_keys.pop(retry_key, None)
+            self.refresh_tracker.track(
+                "bulkhead_reject", {"industry": request.industry.value}
+            )
+            return
 
         def job() -> None:
             try:
@@ -362,10 +685,16 @@ class GeoSimulationEngine:
                     retry_key=retry_key,
                 )
             finally:
-                with self._version_lock:
-                    self._pending_retry_keys.discard(retry_key)
+                self._pending_retry_keys.pop(retry_key, None)
+                self._retry_slots.release()
 
-        self.retry_executor(job)
+        try:
+            self.retry_executor(job)
+        except Exception:
+            # The job never ran, so its finally did not free the slot or key.
+            self._pending_retry_keys.pop(retry_key, None)
+            self._retry_slots.release()
+            raise
 
     def _retry_realtime_refresh(
         self,
@@ -374,15 +703,26 @@ class GeoSimulationEngine:
         benchmark_copy: str,
         retry_key: str,
     ) -> None:
-        try:
-            llm_result = self.orchestrator.simulate(
-                request,
-                iterations=self.iterations,
-            )
-        except SensitiveContentError:
-            return
-        if llm_result.cache_note or llm_result.degraded or not llm_result.observations:
+        for attempt in range(self.refresh_attempts):
+            if self.circuit_breaker.state is CircuitState.OPEN:
+                return
+            if attempt:
+                # Full jitter keeps concurrent refreshes from retrying in lockstep.
+                backoff = min(self._RETRY_BACKOFF_CAP, 2 ** (attempt - 1))
+                delay = backoff * random.uniform(0.5, 1.0)
+                self.refresh_tracker.track("retry_attempt", {"n": attempt, "sleep": delay})
+                self.retry_sleep(delay)
+            try:
+                source, llm_result = self._guarded_simulate(request, self.refresh_tracker)
+            except (SensitiveContentError, CircuitOpenError):
+                return
+            if self._is_cacheable(llm_result):
+                break
+        else:
             return
+        if not self._should_use_industry_estimation(request):
+            # The refresh always goes live; it only writes the cache.
+            self.llm_cache.store(request, self.iterations, self._detached_run(llm_result))
         metrics = self._build_metrics_from_observations(
             llm_result.observations,
             request,
@@ -392,7 +732,7 @@ class GeoSimulationEngine:
         )
         metrics.coverage = llm_result.coverage
         metrics.cache_note = None
-        self._record_trace_summary(llm_result.task_id, metrics)
+        self._record_trace_summary(llm_result.task_id, metrics, source)
         conversion_card = self._build_conversion_card(metrics, request)
         advices = self._build_advices(metrics, request)
         report = DiagnosticReport(
@@ -417,132 +757,62 @@ class GeoSimulationEngine:
         return self._next_report_version_for_key(key)
 
     def _next_report_version_for_key(self, key: str) -> int:
-        with self._version_lock:
-            version = self._version_store.get(key, 0) + 1
-            self._version_store[key] = version
-            return version
-
-    def _default_retry_executor(self, job: Callable[[], None]) -> None:
-        worker = threading.Thread(target=job, daemon=True)
-        worker.start()
+        counter = self._version_counters.get(key)
+        if counter is None:
+            with self._version_store_lock:
+                counter = self._version_counters.setdefault(key, count(1))
+        return next(counter)
 
     def _clone_request(self, request: DiagnosisRequest) -> DiagnosisRequest:
-        return DiagnosisRequest(
-            company_name=request.company_name,
-            product_name=request.product_name,
-            product_description=request.product_description,
-            industry=request.industry,
-            work_email=request.work_email,
-        )
+        # init=False fields (the normalisation memo) start fresh on the copy.
+        return replace(request)
 
     def _fallback_competitor(self, request: DiagnosisRequest) -> Optional[str]:
-        inline = re.findall(r"[A-Z][A-Za-z0-9\-]+", request.product_description)
-        deduped: Dict[str, None] = {}
-        for candidate in inline:
-            deduped.setdefault(candidate, None)
-        if deduped:
-            normalized_company = request.company_name.lower()
-            normalized_product = request.product_name.lower()
-            for candidate in deduped:
-                lowered = candidate.lower()
-                if lowered not in {normalized_company, normalized_product}:
-                    return candidate
-        industry_candidates = self._INDUSTRY_COMPETITORS.get(request.industry, [])
-        return industry_candidates[0] if industry_candidates else None
+        own_names = {request.company_name.lower(), request.product_name.lower()}
+        for match in MENTION_RE.finditer(request.product_description):
+            candidate = match.group()
+            if candidate.lower() not in own_names:
+                return candidate
+        return _FIRST_COMPETITOR.get(request.industry)
 
     def _build_conversion_card(
         self, metrics: SimulationMetrics, request: DiagnosisRequest
     ) -> ConversionCard:
         # PRD: F-04 – drive动态 CTA based on SOV/负面阈值.
-        sov = metrics.sov_percentage
-        negative = metrics.negative_rate
-        if sov < 15 or negative > 10:
-            mode = "crisis"
-            title = "您的品牌正在被 AI 遗忘"
-            body = "您在 AI 里的存在感低于行业基准 40%。如不干预，市场将被竞品瓜分。"
-            cta = "联系铭予：立即修复声誉"
-            tone_icon = "🔴"
-        elif 15 <= sov < 60:
-            mode = "growth"
-            title = "您错失了 40%+ 的精准流量"
-            top_competitor = next(iter(metrics.competitors), "竞品")
-            body = (
-                f"您已进入视野，但排名被{top_competitor}压制。"
-                "铭予 GEO 方案可帮您跃升至 Top 3。"
-            )
-            cta = "联系铭予：获取增长方案"
-            tone_icon = "⚡️"
+        if metrics.negative_rate > 10:
+            template = _CONVERSION_TEMPLATES[0]
         else:
-            mode = "defense"
-            title = "表现卓越，但需警惕追兵"
-            body = (
-                "新锐竞品正在通过 GEO 试图取代您的位置。铭予帮您建立数据护城河。"
-            )
-            cta = "联系铭予：巩固领袖地位"
-            tone_icon = "🛡️"
-        return ConversionCard(
-            mode=mode,
-            title=title,
-            body=body,
-            cta=cta,
-            tone_icon=tone_icon,
-        )
+            template = _CONVERSION_TEMPLATES[
+                bisect_right(_CONVERSION_SOV_THRESHOLDS, metrics.sov_percentage)
+            ]
+        if template.mode == "growth":
+            top_competitor = metrics.top_competitor or "竞品"
+            return replace(template, body=template.body.format(competitor=top_competitor))
+        # Cards are frozen, so the shared template can be handed out as is.
+        return template
 
     def _build_advices(
         self, metrics: SimulationMetrics, request: DiagnosisRequest
     ) -> List[AdviceItem]:
-        advices: List[AdviceItem] = []
-        industry_label = request.industry.display_label
         # PRD: F-05 – three tactical bulletins based on SOV/负面/竞品.
         if metrics.sov_percentage < 40:
-            advices.append(
-                AdviceItem(
-                    text=(
-                        f"建议增加‘{request.product_name} + {industry_label}场景’的"
-                        "高权重语料投喂，强化实体关联。"
-                    )
-                )
-            )
+            sov_text = _LOW_SOV_ADVICE[request.industry].format(product=request.product_name)
         else:
-            advices.append(
-                AdviceItem(
-                    text=(
-                        f"{request.product_name} 的声量高于行业均值，"
-                        "请继续用案例夯实语义锚点。"
-                    )
-                )
-            )
+            sov_text = _HIGH_SOV_ADVICE.format(product=request.product_name)
 
         negative_tag = metrics.negative_tags[0] if metrics.negative_tags else "体验顺畅"
         if metrics.negative_rate > 10:
-            advices.append(
-                AdviceItem(
-                    text=(
-                        f"检测到‘{negative_tag}’标签。建议针对性发布技术解析文章进行语义清洗。"
-                    )
-                )
-            )
+            negative_text = _NEGATIVE_TAG_ADVICE.format(tag=negative_tag)
         else:
-            advices.append(
-                AdviceItem(
-                    text="保持积极口碑，并定期同步 Roadmap，防止旧反馈被放大。"
-                )
-            )
+            negative_text = _STEADY_SENTIMENT_ADVICE
 
-        if metrics.competitors:
-            competitor = max(metrics.competitors, key=metrics.competitors.get)
-            advices.append(
-                AdviceItem(
-                    text=(
-                        f"建议在语料中强调与{competitor}的差异化功能，建立独特性神经元连接。"
-                    )
-                )
-            )
+        if metrics.top_competitor:
+            competitor_text = _COMPETITOR_ADVICE.format(competitor=metrics.top_competitor)
         else:
-            advices.append(
-                AdviceItem(
-                    text="建议持续监测新竞品，并将差异化卖点固化到 Prompt。"
-                )
-            )
+            competitor_text = _NO_COMPETITOR_ADVICE
 
-        return advices
+        return [
+            AdviceItem(text=sov_text),
+            AdviceItem(text=negative_text),
+            AdviceItem(text=competitor_text),
+        ]
@@ -2,26 +2,86 @@ from __future__ import annotations
 
 import hashlib
 import os
+import random
 import re
 import threading
 import time
 import uuid
-from dataclasses import dataclass, replace
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
+from itertools import cycle, islice
+from typing import Any, Callable, Deque, Dict, Iterable, List, Mapping, Optional, Protocol, Set, Tuple, Union
 
 import requests
+from requests.adapters import HTTPAdapter
 
+from .cache import InMemoryLRU
 from .errors import SensitiveContentError
-from .models import DiagnosisRequest, Industry, SENSITIVE_KEYWORDS, SENSITIVE_BLOCK_MESSAGE
+from .models import (
+    DiagnosisRequest,
+    Industry,
+    SENSITIVE_BLOCK_MESSAGE,
+    SENSITIVE_RE,
+)
+
+
+# Keyword lexicons may be passed as a mapping or as ordered (keyword, delta) pairs.
+KeywordWeights = Union[Mapping[str, float], Iterable[Tuple[str, float]]]
+# Capitalised brand-like tokens; shared with the engine's competitor fallback.
+MENTION_RE = re.compile(r"[A-Z][A-Za-z0-9\-]+")
+
+
+def _build_shared_session(pool_size: int = 16) -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["Content-Type"] = "application/json"
+    return session
+
+
+# Keep-alive pool shared by every Doubao/DeepSeek client that is not given
+# its own session, so repeated calls skip the TCP + TLS handshake.
+# Authorization stays per-request because the clients use different keys.
+_SHARED_SESSION = _build_shared_session()
+
+
+@dataclass(frozen=True, slots=True)
+class SecretSnapshot:
+    """Read-only point-in-time view of one registered secret."""
+
+    api_key: str
+    quota_limit: int
+    expires_at: Optional[float]
+    usage: int
+    alerted: bool
+
+
+@dataclass
+class _SecretRecord:
+    api_key: str
+    quota_limit: int
+    expires_at: Optional[float]
+    usage: int = 0
+    alerted: bool = False
+    # Per-key lock: usage on one provider never waits on the other.
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
 
 
 class SecretsManager:
-    """Thread-safe secrets registry that tracks quota usage (PRD F-06.1)."""
+    """Thread-safe secrets registry that tracks quota usage (PRD F-06.1).
+
+    Registration swaps whole records under the registry lock, so `get_key`
+    reads without locking; usage counters are guarded per key.
+    """
 
     def __init__(self) -> None:
-        self._records: Dict[str, Dict[str, Any]] = {}
+        self._records: Dict[str, _SecretRecord] = {}
         self._lock = threading.Lock()
         self._alerts: List[Dict[str, Any]] = []
+        self._alerts_lock = threading.Lock()
 
     def register_key(
         self,
@@ -32,23 +92,18 @@ class SecretsManager:
         expires_at: Optional[float] = None,
     ) -> None:
         with self._lock:
-            self._records[name] = {
-                "api_key": api_key,
-                "quota_limit": quota_limit,
-                "expires_at": expires_at,
-                "usage": 0,
-                "alerted": False,
-            }
+            self._records[name] = _SecretRecord(
+                api_key=api_key, quota_limit=quota_limit, expires_at=expires_at
+            )
 
     def has_key(self, name: str) -> bool:
-        with self._lock:
-            return name in self._records
+        return name in self._records
 
     def get_key(self, name: str) -> str:
-        with self._lock:
-            if name not in self._records:
-                raise KeyError(f"Secret '{name}' not found")
-            return self._records[name]["api_key"]
+        record = self._records.get(name)
+        if record is None:
+            raise KeyError(f"Secret '{name}' not found")
+        return record.api_key
 
     def revoke_key(self, name: str) -> None:
         with self._lock:
@@ -57,32 +112,40 @@ class SecretsManager:
     def record_usage(self, name: str, used_tokens: int) -> None:
         if used_tokens <= 0:
             return
-        with self._lock:
-            record = self._records.get(name)
-            if not record:
+        record = self._records.get(name)
+        if not record:
+            return
+        with record.lock:
+            record.usage += used_tokens
+            quota = record.quota_limit or 0
+            if not quota or record.alerted or record.usage < quota * 0.8:
                 return
-            record["usage"] += used_tokens
-            quota = record.get("quota_limit") or 0
-            if quota and not record["alerted"] and record["usage"] >= quota * 0.8:
-                record["alerted"] = True
-                self._alerts.append(
-                    {
-                        "name": name,
-                        "message": "API Key usage exceeded 80% of quota",
-                        "usage": record["usage"],
-                        "quota_limit": quota,
-                        "expires_at": record.get("expires_at"),
-                    }
-                )
-
-    def snapshot(self, name: str) -> Dict[str, Any]:
-        with self._lock:
-            if name not in self._records:
-                raise KeyError(f"Secret '{name}' not found")
-            return dict(self._records[name])
+            record.alerted = True
+            alert = {
+                "name": name,
+                "message": "API Key usage exceeded 80% of quota",
+                "usage": record.usage,
+                "quota_limit": quota,
+                "expires_at": record.expires_at,
+            }
+        with self._alerts_lock:
+            self._alerts.append(alert)
+
+    def snapshot(self, name: str) -> SecretSnapshot:
+        record = self._records.get(name)
+        if record is None:
+            raise KeyError(f"Secret '{name}' not found")
+        with record.lock:
+            return SecretSnapshot(
+                api_key=record.api_key,
+                quota_limit=record.quota_limit,
+                expires_at=record.expires_at,
+                usage=record.usage,
+                alerted=record.alerted,
+            )
 
     def consume_alerts(self) -> List[Dict[str, Any]]:
-        with self._lock:
+        with self._alerts_lock:
             alerts = list(self._alerts)
             self._alerts.clear()
         return alerts
@@ -96,31 +159,89 @@ class LLMClientError(RuntimeError):
     pass
 
 
+# Tokens are stored in units of 1/_NS_PER_MINUTE so an RPM refill over an
+# integer nanosecond interval is exact integer math.
+_NS_PER_MINUTE = 60 * 1_000_000_000
+
+
 class TokenBucket:
-    """Simple RPM bucket for Doubao/DeepSeek (PRD F-06.3)."""
+    """Simple RPM bucket for Doubao/DeepSeek (PRD F-06.3).
+
+    State is an immutable `(updated_at_ns, scaled_tokens)` tuple: `consume`
+    computes the refill outside the lock and only holds it to compare-and-swap
+    the tuple, retrying if another thread won the race.
+    """
 
     def __init__(self, *, capacity: int = 60, refill_rate_per_min: int = 60) -> None:
         self.capacity = float(capacity)
-        self.tokens = float(capacity)
         self.refill_rate = refill_rate_per_min / 60.0
-        self.updated_at = time.monotonic()
+        self._capacity_scaled = capacity * _NS_PER_MINUTE
+        # Scaled tokens gained per elapsed nanosecond.
+        self._refill_per_ns = refill_rate_per_min
+        self._state: Tuple[int, int] = (time.monotonic_ns(), self._capacity_scaled)
         self._lock = threading.Lock()
 
+    @property
+    def tokens(self) -> float:
+        return self._state[1] / _NS_PER_MINUTE
+
+    @property
+    def updated_at(self) -> float:
+        return self._state[0] / 1_000_000_000
+
     def consume(self, tokens: int = 1) -> None:
-        with self._lock:
-            self._refill()
-            if tokens > self.tokens:
+        needed = tokens * _NS_PER_MINUTE
+        while True:
+            state = self._state
+            updated_at_ns, available = self._refill(state)
+            if needed > available:
                 raise RateLimitError("Token bucket empty")
-            self.tokens -= tokens
+            new_state = (updated_at_ns, available - needed)
+            with self._lock:
+                if self._state is state:
+                    self._state = new_state
+                    return
 
-    def _refill(self) -> None:
-        now = time.monotonic()
-        elapsed = now - self.updated_at
-        if elapsed <= 0:
-            return
-        refill = elapsed * self.refill_rate
-        self.tokens = min(self.capacity, self.tokens + refill)
-        self.updated_at = now
+    def _refill(self, state: Tuple[int, int]) -> Tuple[int, int]:
+        updated_at_ns, available = state
+        now_ns = time.monotonic_ns()
+        elapsed_ns = now_ns - updated_at_ns
+        if elapsed_ns <= 0:
+            return state
+        return now_ns, min(self._capacity_scaled, available + elapsed_ns * self._refill_per_ns)
+
+
+class HttpTransport(Protocol):
+    """Wire contract for the chat clients; inject a fake to test without HTTP."""
+
+    def post(
+        self,
+        url: str,
+        *,
+        headers: Mapping[str, str],
+        json_body: Dict[str, Any],
+        timeout: float,
+    ) -> Dict[str, Any]:
+        ...
+
+
+class RequestsTransport:
+    """Default transport: JSON POST over a (pooled) requests.Session."""
+
+    def __init__(self, session: Optional[requests.Session] = None) -> None:
+        self.session = session or _SHARED_SESSION
+
+    def post(
+        self,
+        url: str,
+        *,
+        headers: Mapping[str, str],
+        json_body: Dict[str, Any],
+        timeout: float,
+    ) -> Dict[str, Any]:
+        response = self.session.post(url, headers=headers, json=json_body, timeout=timeout)
+        response.raise_for_status()
+        return response.json()
 
 
 class BaseChatClient:
@@ -136,32 +257,39 @@ class BaseChatClient:
         token_bucket: TokenBucket,
         timeout: int = 30,
         session: Optional[requests.Session] = None,
+        transport: Optional[HttpTransport] = None,
     ) -> None:
         self.base_url = base_url.rstrip("/")
+        self._endpoint = f"{self.base_url}/v1/chat/completions"
         self.model = model
         self.secret_name = secret_name
         self.secrets = secrets
         self.token_bucket = token_bucket
         self.timeout = timeout
-        self.session = session or requests.Session()
+        self.session = session or _SHARED_SESSION
+        self.transport: HttpTransport = transport or RequestsTransport(self.session)
+        self._header_cache: Tuple[Optional[str], Dict[str, str]] = (None, {})
 
     def _headers(self) -> Dict[str, str]:
+        # Rebuilt only when the key is rotated in SecretsManager.
         api_key = self.secrets.get_key(self.secret_name)
-        return {
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json",
-        }
+        cached_key, headers = self._header_cache
+        if api_key != cached_key:
+            headers = {
+                "Authorization": f"Bearer {api_key}",
+                "Content-Type": "application/json",
+            }
+            self._header_cache = (api_key, headers)
+        return headers
 
     def _post(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         self.token_bucket.consume()
-        response = self.session.post(
-            f"{self.base_url}/v1/chat/completions",
+        data = self.transport.post(
+            self._endpoint,
             headers=self._headers(),
-            json=payload,
+            json_body=payload,
             timeout=self.timeout,
         )
-        response.raise_for_status()
-        data = response.json()
         usage = data.get("usage", {})
         self.secrets.record_usage(self.secret_name, int(usage.get("total_tokens", 0)))
         return data
@@ -177,6 +305,7 @@ class DoubaoClient(BaseChatClient):
         model: str = "doubao-pro",
         timeout: int = 30,
         session: Optional[requests.Session] = None,
+        transport: Optional[HttpTransport] = None,
     ) -> None:
         super().__init__(
             base_url=base_url,
@@ -186,16 +315,21 @@ class DoubaoClient(BaseChatClient):
             token_bucket=token_bucket,
             timeout=timeout,
             session=session,
+            transport=transport,
         )
-
-    def create_chat_completion(self, *, messages: List[Dict[str, str]], **extra: Any) -> Dict[str, Any]:
-        payload: Dict[str, Any] = {
+        # Steady-state payload; `messages` is a placeholder keeping key order.
+        self._payload_template: Dict[str, Any] = {
             "model": self.model,
-            "messages": messages,
-            "temperature": extra.get("temperature", 0.4),
-            "top_p": extra.get("top_p", 0.8),
+            "messages": None,
+            "temperature": 0.4,
+            "top_p": 0.8,
         }
-        payload.update(extra)
+
+    def create_chat_completion(self, *, messages: List[Dict[str, str]], **extra: Any) -> Dict[str, Any]:
+        payload = self._payload_template.copy()
+        payload["messages"] = messages
+        if extra:
+            payload.update(extra)
         return self._post(payload)
 
 
@@ -209,6 +343,7 @@ class DeepSeekClient(BaseChatClient):
         model: str = "deepseek-chat",
         timeout: int = 30,
         session: Optional[requests.Session] = None,
+        transport: Optional[HttpTransport] = None,
     ) -> None:
         super().__init__(
             base_url=base_url,
@@ -218,15 +353,19 @@ class DeepSeekClient(BaseChatClient):
             token_bucket=token_bucket,
             timeout=timeout,
             session=session,
+            transport=transport,
         )
-
-    def create_chat_completion(self, *, messages: List[Dict[str, str]], **extra: Any) -> Dict[str, Any]:
-        payload: Dict[str, Any] = {
+        self._payload_template: Dict[str, Any] = {
             "model": self.model,
-            "messages": messages,
-            "max_tokens": extra.get("max_tokens", 512),
+            "messages": None,
+            "max_tokens": 512,
         }
-        payload.update(extra)
+
+    def create_chat_completion(self, *, messages: List[Dict[str, str]], **extra: Any) -> Dict[str, Any]:
+        payload = self._payload_template.copy()
+        payload["messages"] = messages
+        if extra:
+            payload.update(extra)
         data = self._post(payload)
         for choice in data.get("choices", []):
             finish_reason = choice.get("finish_reason")
@@ -235,7 +374,7 @@ class DeepSeekClient(BaseChatClient):
         return data
 
 
-@dataclass
+@dataclass(slots=True)
 class LLMCall:
     task_id: str
     platform: str
@@ -249,7 +388,7 @@ class LLMCall:
     latency_ms: float
 
 
-@dataclass
+@dataclass(slots=True)
 class RawTraceEntry:
     platform: str
     prompt_type: str
@@ -260,14 +399,19 @@ class RawTraceEntry:
     recorded_at: float
 
 
-@dataclass
+@dataclass(slots=True)
 class SummaryTraceEntry:
     payload: Dict[str, Any]
     recorded_at: float
 
 
 class LLMTraceStore:
-    """In-memory trace store with retention policy (PRD F-06.4)."""
+    """In-memory trace store with retention policy (PRD F-06.4).
+
+    Both maps are kept in write order (oldest first) and each task's raw
+    entries are appended chronologically, so expiry pops from the front and
+    only touches entries that have actually aged out.
+    """
 
     def __init__(
         self,
@@ -279,8 +423,10 @@ class LLMTraceStore:
         self.raw_ttl = raw_ttl
         self.summary_ttl = summary_ttl
         self._time = time_fn or time.time
-        self._raw: Dict[str, List[RawTraceEntry]] = {}
-        self._summary: Dict[str, SummaryTraceEntry] = {}
+        self._raw: "OrderedDict[str, Deque[RawTraceEntry]]" = OrderedDict()
+        self._summary: "OrderedDict[str, SummaryTraceEntry]" = OrderedDict()
+        # Platforms record concurrently from the orchestrator's worker threads.
+        self._lock = threading.Lock()
 
     def record_raw(self, call: LLMCall) -> None:
         now = self._time()
@@ -293,19 +439,34 @@ class LLMTraceStore:
             latency_ms=call.latency_ms,
             recorded_at=now,
         )
-        self._raw.setdefault(call.task_id, []).append(entry)
-        self._cleanup()
+        with self._lock:
+            entries = self._raw.get(call.task_id)
+            if entries is None:
+                entries = self._raw[call.task_id] = deque()
+            else:
+                self._raw.move_to_end(call.task_id)
+            entries.append(entry)
+            self._cleanup(now)
 
     def record_summary(self, task_id: str, payload: Dict[str, Any]) -> None:
         now = self._time()
-        self._summary[task_id] = SummaryTraceEntry(
-            payload=dict(payload),
-            recorded_at=now,
-        )
-        self._cleanup()
+        with self._lock:
+            self._summary.pop(task_id, None)
+            self._summary[task_id] = SummaryTraceEntry(
+                payload=dict(payload),
+                recorded_at=now,
+            )
+            self._cleanup(now)
 
     def get_trace(self, task_id: str) -> Dict[str, Any]:
-        self._cleanup()
+        now = self._time()
+        with self._lock:
+            self._cleanup(now)
+            entries = self._raw.get(task_id)
+            if entries is not None:
+                self._expire_raw(entries, now - self.raw_ttl)
+                entries = list(entries)
+            existing_summary = self._summary.get(task_id)
         raw_entries = [
             {
                 "platform": entry.platform,
@@ -316,10 +477,9 @@ class LLMTraceStore:
                 "latency_ms": round(entry.latency_ms, 2),
                 "recorded_at": entry.recorded_at,
             }
-            for entry in self._raw.get(task_id, [])
+            for entry in entries or ()
         ]
         summary = None
-        existing_summary = self._summary.get(task_id)
         if existing_summary:
             summary = {
                 **existing_summary.payload,
@@ -327,24 +487,31 @@ class LLMTraceStore:
             }
         return {"task_id": task_id, "raw": raw_entries, "summary": summary}
 
-    def _cleanup(self) -> None:
-        now = self._time()
-        for task_id, entries in list(self._raw.items()):
-            filtered = [
-                entry
-                for entry in entries
-                if now - entry.recorded_at <= self.raw_ttl
-            ]
-            if filtered:
-                self._raw[task_id] = filtered
-            else:
-                self._raw.pop(task_id, None)
-        for task_id, summary in list(self._summary.items()):
-            if now - summary.recorded_at > self.summary_ttl:
-                self._summary.pop(task_id, None)
+    @staticmethod
+    def _expire_raw(entries: Deque[RawTraceEntry], cutoff: float) -> None:
+        while entries and entries[0].recorded_at < cutoff:
+            entries.popleft()
+
+    def _cleanup(self, now: float) -> None:
+        raw_cutoff = now - self.raw_ttl
+        while self._raw:
+            task_id, entries = next(iter(self._raw.items()))
+            self._expire_raw(entries, raw_cutoff)
+            if entries:
+                # The least recently written task still has a fresh entry, so
+                # every later task does too; stale heads of those are trimmed
+                # when they reach the front or are read.
+                break
+            del self._raw[task_id]
+        summary_cutoff = now - self.summary_ttl
+        while self._summary:
+            task_id, summary = next(iter(self._summary.items()))
+            if summary.recorded_at >= summary_cutoff:
+                break
+            del self._summary[task_id]
 
 
-@dataclass
+@dataclass(slots=True)
 class LLMObservation:
     iteration: int
     platform: str
@@ -356,7 +523,7 @@ class LLMObservation:
     cached: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class LLMRunResult:
     task_id: str
     observations: List[LLMObservation]
@@ -365,14 +532,70 @@ class LLMRunResult:
     degraded: bool
 
 
+class KeywordScanner:
+    """Matches both sentiment lexicons in one regex pass over the text.
+
+    Built once and shared, e.g. by every engine using the default lexicons.
+    Semantics match per-keyword substring tests: a keyword hits if it occurs
+    anywhere, and hits are reported in lexicon order.
+    """
+
+    def __init__(
+        self,
+        positive_keywords: Optional[KeywordWeights] = None,
+        negative_keywords: Optional[KeywordWeights] = None,
+    ) -> None:
+        self.positive = tuple(
+            (keyword.lower(), delta) for keyword, delta in dict(positive_keywords or {}).items()
+        )
+        self.negative = tuple(
+            (keyword.lower(), delta) for keyword, delta in dict(negative_keywords or {}).items()
+        )
+        keywords = {keyword for keyword, _ in self.positive + self.negative}
+        self._always: Set[str] = {""} & keywords
+        keywords -= self._always
+        # Zero-width lookahead finds matches at every offset, longest first;
+        # shorter keywords nested inside a match are implied via `_nested`.
+        ordered = sorted(keywords, key=len, reverse=True)
+        self._pattern = (
+            re.compile("(?=(%s))" % "|".join(map(re.escape, ordered))) if ordered else None
+        )
+        self._nested = {
+            keyword: tuple(other for other in keywords if other != keyword and other in keyword)
+            for keyword in keywords
+        }
+
+    def matches(self, normalized: str) -> Set[str]:
+        found = set(self._always)
+        if self._pattern is None:
+            return found
+        for match in self._pattern.finditer(normalized):
+            keyword = match.group(1)
+            if keyword not in found:
+                found.add(keyword)
+                found.update(self._nested[keyword])
+        return found
+
+    def hits(self, normalized: str) -> Tuple[List[float], List[float]]:
+        """Return matched (positive, negative) deltas for lowercased text."""
+        found = self.matches(normalized)
+        return (
+            [delta for keyword, delta in self.positive if keyword in found],
+            [delta for keyword, delta in self.negative if keyword in found],
+        )
+
+
 class LLMOrchestrator:
     """Coordinates real Doubao/DeepSeek calls + fallback logic (PRD F-06, E-01/E-02)."""
 
     _EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
     _PHONE_RE = re.compile(r"\b\d{3,4}-?\d{4,}\b")
     _ADDRESS_RE = re.compile(r"[\w\d]{0,10}(?:路|街|道|号)\w*", re.UNICODE)
-    _MENTION_RE = re.compile(r"[A-Z][A-Za-z0-9\-]+")
+    _ADDRESS_MARKERS = frozenset("路街道号")
+    _DIGIT_RE = re.compile(r"\d")
+    _MENTION_RE = MENTION_RE
     _PLATFORM_LABELS = {"doubao": "豆包", "deepseek": "DeepSeek"}
+    _RETRY_BACKOFF_CAP = 10.0
 
     def __init__(
         self,
@@ -381,20 +604,33 @@ class LLMOrchestrator:
         doubao_client: Optional[DoubaoClient] = None,
         deepseek_client: Optional[DeepSeekClient] = None,
         cache_ttl: int = 86400,
+        cache_max_entries: int = 1024,
         industry_competitors: Optional[Dict[Industry, List[str]]] = None,
-        positive_keywords: Optional[Dict[str, float]] = None,
-        negative_keywords: Optional[Dict[str, float]] = None,
+        positive_keywords: Optional[KeywordWeights] = None,
+        negative_keywords: Optional[KeywordWeights] = None,
         negative_tags: Optional[List[str]] = None,
         trace_store: Optional[LLMTraceStore] = None,
+        keyword_scanner: Optional[KeywordScanner] = None,
+        retry_sleep: Callable[[float], None] = time.sleep,
+        batch_iterations: bool = False,
     ) -> None:
         self.secrets = secrets or SecretsManager()
+        self.retry_sleep = retry_sleep
+        # Opt-in: ask each vendor for `n=iterations` choices per prompt instead
+        # of one round-trip per iteration. Only enable for endpoints that honour
+        # `n`; a vendor returning fewer choices yields fewer observations.
+        self.batch_iterations = batch_iterations
         self.cache_ttl = cache_ttl
         self.industry_competitors = industry_competitors or {}
-        self.positive_keywords = positive_keywords or {}
-        self.negative_keywords = negative_keywords or {}
+        self.positive_keywords = dict(positive_keywords or {})
+        self.negative_keywords = dict(negative_keywords or {})
         self.negative_tags = negative_tags or ["体验顺畅"]
+        self.keyword_scanner = keyword_scanner or KeywordScanner(
+            self.positive_keywords, self.negative_keywords
+        )
         self.trace_store = trace_store or LLMTraceStore()
-        self._cache: Dict[str, Tuple[float, LLMCall]] = {}
+        # Bounded so long-running orchestrators do not accumulate responses.
+        self._cache = InMemoryLRU(cache_max_entries, time_fn=time.time)
         self._task_queue: List[str] = []
         self._llm_logs: List[Dict[str, Any]] = []
         self._parser_version = "geo-llm-parser-v1"
@@ -408,10 +644,19 @@ class LLMOrchestrator:
             "deepseek": deepseek_client or self._build_deepseek_client(),
         }
 
+    def shutdown(self) -> None:
+        """No-op: platform workers only live for the duration of each call."""
+
     @property
     def task_queue(self) -> List[str]:
         return list(self._task_queue)
 
+    def register_task(self) -> str:
+        """Issue a new task id and queue it, e.g. for a run served from cache."""
+        task_id = str(uuid.uuid4())
+        self._task_queue.append(task_id)
+        return task_id
+
     @property
     def llm_logs(self) -> List[Dict[str, Any]]:
         return list(self._llm_logs)
@@ -423,35 +668,37 @@ class LLMOrchestrator:
 
     def _simulate_offline(self, request: DiagnosisRequest, iterations: int) -> LLMRunResult:
         base_strength = 0.45
-        normalized_desc = request.product_description.lower()
-        for keyword, delta in self.positive_keywords.items():
-            if keyword.lower() in normalized_desc:
-                base_strength += delta
-        for keyword, delta in self.negative_keywords.items():
-            if keyword.lower() in normalized_desc:
-                base_strength -= delta / 2
+        normalized_desc = request.normalized_description()
+        positive_hits, negative_hits = self._keyword_hits(normalized_desc)
+        for delta in positive_hits:
+            base_strength += delta
+        for delta in negative_hits:
+            base_strength -= delta / 2
         base_strength = max(0.05, min(0.95, base_strength))
         recommended_runs = int(round(iterations * base_strength))
 
         negative_ratio = 0.1
-        for keyword, delta in self.negative_keywords.items():
-            if keyword.lower() in normalized_desc:
-                negative_ratio += delta
+        for delta in negative_hits:
+            negative_ratio += delta
         negative_ratio = min(0.9, max(0.0, negative_ratio))
         negative_runs = int(round(iterations * negative_ratio))
 
         competitors = self._inline_competitors(request)
+        # Outcomes only depend on the iteration index, so build each column once
+        # and share it across platforms; only the competitor rotation differs.
+        recommended_flags = [True] * recommended_runs + [False] * (iterations - recommended_runs)
+        sentiments = [-0.3] * negative_runs + [0.2] * (iterations - negative_runs)
+        tags = list(islice(cycle(self.negative_tags), iterations))
         observations: List[LLMObservation] = []
-        platforms = ["doubao", "deepseek"]
-        for platform_key in platforms:
-            platform_label = self._PLATFORM_LABELS[platform_key]
-            for iteration in range(iterations):
-                recommended = iteration < recommended_runs
+        for platform_offset, (platform_key, platform_label) in enumerate(
+            self._PLATFORM_LABELS.items()
+        ):
+            for iteration, (recommended, sentiment, tag) in enumerate(
+                zip(recommended_flags, sentiments, tags)
+            ):
                 competitor = None
                 if not recommended and competitors:
-                    competitor = competitors[(iteration + platforms.index(platform_key)) % len(competitors)]
-                sentiment = -0.3 if iteration < negative_runs else 0.2
-                tag = self.negative_tags[iteration % len(self.negative_tags)]
+                    competitor = competitors[(iteration + platform_offset) % len(competitors)]
                 observations.append(
                     LLMObservation(
                         iteration=len(observations) + 1,
@@ -472,67 +719,68 @@ class LLMOrchestrator:
         )
 
     def _simulate_online(self, request: DiagnosisRequest, iterations: int) -> LLMRunResult:
-        task_id = str(uuid.uuid4())
-        self._task_queue.append(task_id)
+        task_id = self.register_task()
         coverage = {name: False for name in self.clients}
-        strike_counts = {name: 0 for name in self.clients}
-        cache_note: Optional[str] = None
         active_clients = {name: client for name, client in self.clients.items() if client}
         if not active_clients:
             return self._simulate_offline(request, iterations)
 
+        # Prompts only depend on the request: build and hash them once per task.
+        # Each message list is shared by every iteration and retry, so vendors
+        # see a byte-identical prompt and their prefix caches can hit.
+        prompts = tuple(
+            (prompt_type, [{"role": "user", "content": prompt}], self._prompt_hash(prompt))
+            for prompt_type, prompt in (
+                ("discovery", self._build_discovery_prompt(request)),
+                ("evaluation", self._build_evaluation_prompt(request)),
+            )
+        )
+        # Platforms share no state (strikes, cache keys, token buckets), so each
+        # runs its iterations on its own thread; calls to a given client stay
+        # sequential and in order. A blocked response on any platform sets
+        # `blocked` so the others stop calling vendors for a doomed request.
+        blocked = threading.Event()
+        platform_args = [
+            (task_id, platform_key, client, prompts, iterations, blocked)
+            for platform_key, client in active_clients.items()
+        ]
+        run_platform = self._run_platform_batched if self.batch_iterations else self._run_platform
+        if len(platform_args) == 1:
+            runs = [run_platform(*platform_args[0])]
+        else:
+            # Workers are per call: a pool shared by the orchestrator would
+            # queue concurrent diagnoses behind each other. The first platform
+            # runs on the calling thread, so only the others need workers.
+            with ThreadPoolExecutor(
+                max_workers=len(platform_args) - 1, thread_name_prefix="geo-platform"
+            ) as pool:
+                futures = [pool.submit(run_platform, *args) for args in platform_args[1:]]
+                first = run_platform(*platform_args[0])
+                runs = [first] + [future.result() for future in futures]
+
+        cache_note: Optional[str] = None
+        per_iteration: Dict[int, List[Tuple[str, Dict[str, LLMCall]]]] = {}
+        for platform_key, platform_calls, covered, platform_note in runs:
+            coverage[platform_key] = covered
+            cache_note = platform_note or cache_note
+            for iteration, iteration_calls in platform_calls:
+                per_iteration.setdefault(iteration, []).append((platform_key, iteration_calls))
+
+        # Merge back in (iteration, platform) order to keep the serial numbering.
+        competitors = self._inline_competitors(request)
         observations: List[LLMObservation] = []
-        for iteration in range(iterations):
-            for platform_key in list(active_clients.keys()):
-                client = active_clients.get(platform_key)
-                if not client:
-                    continue
-                platform_label = self._PLATFORM_LABELS.get(platform_key, platform_key)
-                iteration_calls: Dict[str, LLMCall] = {}
-                prompts = (
-                    ("discovery", self._build_discovery_prompt(request)),
-                    ("evaluation", self._build_evaluation_prompt(request)),
-                )
-                for prompt_type, prompt in prompts:
-                    cache_key = self._cache_key(platform_key, prompt)
-                    try:
-                        call = self._invoke_client(
-                            client=client,
-                            task_id=task_id,
-                            platform=platform_label,
-                            platform_key=platform_key,
-                            prompt_type=prompt_type,
-                            prompt=prompt,
-                            request=request,
-                        )
-                        strike_counts[platform_key] = 0
-                        coverage[platform_key] = True
-                        iteration_calls[prompt_type] = call
-                        self._write_cache(cache_key, call)
-                    except SensitiveContentError:
-                        raise
-                    except LLMClientError:
-                        strike_counts[platform_key] += 1
-                        cached_call = self._read_cache(cache_key)
-                        if cached_call:
-                            cache_note = "(来自缓存，已进入实时重试队列)"
-                            iteration_calls[prompt_type] = replace(cached_call, cached=True)
-                        if strike_counts[platform_key] >= 3:
-                            active_clients.pop(platform_key, None)
-                            break
-                if not iteration_calls:
-                    continue
+        for iteration in sorted(per_iteration):
+            for platform_key, iteration_calls in per_iteration[iteration]:
                 observations.append(
                     self._calls_to_observation(
                         iteration=len(observations) + 1,
-                        platform=platform_label,
+                        platform=self._PLATFORM_LABELS.get(platform_key, platform_key),
                         platform_key=platform_key,
                         calls=iteration_calls,
                         request=request,
+                        competitors=competitors,
                     )
                 )
-            if not active_clients:
-                break
 
         degraded = not observations
         if degraded:
@@ -551,6 +799,112 @@ class LLMOrchestrator:
             degraded=False,
         )
 
+    def _run_platform(
+        self,
+        task_id: str,
+        platform_key: str,
+        client: BaseChatClient,
+        prompts: Tuple[Tuple[str, List[Dict[str, str]], str], ...],
+        iterations: int,
+        blocked: threading.Event,
+    ) -> Tuple[str, List[Tuple[int, Dict[str, LLMCall]]], bool, Optional[str]]:
+        """Run every iteration for one platform until it strikes out (E-02)."""
+        platform_label = self._PLATFORM_LABELS.get(platform_key, platform_key)
+        platform_calls: List[Tuple[int, Dict[str, LLMCall]]] = []
+        covered = False
+        cache_note: Optional[str] = None
+        strikes = 0
+        for iteration in range(iterations):
+            if blocked.is_set():
+                break
+            iteration_calls: Dict[str, LLMCall] = {}
+            for prompt_type, messages, prompt_hash in prompts:
+                cache_key = self._cache_key(platform_key, prompt_hash)
+                try:
+                    call = self._invoke_client(
+                        client=client,
+                        task_id=task_id,
+                        platform=platform_label,
+                        platform_key=platform_key,
+                        prompt_type=prompt_type,
+                        messages=messages,
+                        prompt_hash=prompt_hash,
+                    )
+                    strikes = 0
+                    covered = True
+                    iteration_calls[prompt_type] = call
+                    self._write_cache(cache_key, call)
+                except SensitiveContentError:
+                    blocked.set()
+                    raise
+                except LLMClientError:
+                    strikes += 1
+                    cached_call = self._read_cache(cache_key)
+                    if cached_call:
+                        cache_note = "(来自缓存，已进入实时重试队列)"
+                        iteration_calls[prompt_type] = replace(cached_call, cached=True)
+                    if strikes >= 3:
+                        break
+            if iteration_calls:
+                platform_calls.append((iteration, iteration_calls))
+            if strikes >= 3:
+                break
+        return platform_key, platform_calls, covered, cache_note
+
+    def _run_platform_batched(
+        self,
+        task_id: str,
+        platform_key: str,
+        client: BaseChatClient,
+        prompts: Tuple[Tuple[str, List[Dict[str, str]], str], ...],
+        iterations: int,
+        blocked: threading.Event,
+    ) -> Tuple[str, List[Tuple[int, Dict[str, LLMCall]]], bool, Optional[str]]:
+        """Like `_run_platform`, but one `n=iterations` request per prompt."""
+        platform_label = self._PLATFORM_LABELS.get(platform_key, platform_key)
+        covered = False
+        cache_note: Optional[str] = None
+        prompt_calls: Dict[str, List[LLMCall]] = {}
+        for prompt_type, messages, prompt_hash in prompts:
+            if blocked.is_set():
+                break
+            cache_key = self._cache_key(platform_key, prompt_hash)
+            try:
+                calls = self._invoke_client_batch(
+                    client=client,
+                    task_id=task_id,
+                    platform=platform_label,
+                    platform_key=platform_key,
+                    prompt_type=prompt_type,
+                    messages=messages,
+                    prompt_hash=prompt_hash,
+                    n=iterations,
+                )
+                covered = True
+                self._write_cache(cache_key, calls[0])
+            except SensitiveContentError:
+                blocked.set()
+                raise
+            except LLMClientError:
+                # Each batch already retried; a failed prompt falls back to
+                # the cache for every iteration, as the serial path would.
+                calls = []
+                cached_call = self._read_cache(cache_key)
+                if cached_call:
+                    cache_note = "(来自缓存，已进入实时重试队列)"
+                    calls = [replace(cached_call, cached=True)] * iterations
+            prompt_calls[prompt_type] = calls
+        platform_calls: List[Tuple[int, Dict[str, LLMCall]]] = []
+        for iteration in range(iterations):
+            iteration_calls = {
+                prompt_type: calls[iteration]
+                for prompt_type, calls in prompt_calls.items()
+                if iteration < len(calls)
+            }
+            if iteration_calls:
+                platform_calls.append((iteration, iteration_calls))
+        return platform_key, platform_calls, covered, cache_note
+
     def _invoke_client(
         self,
         *,
@@ -559,36 +913,93 @@ class LLMOrchestrator:
         platform: str,
         platform_key: str,
         prompt_type: str,
-        prompt: str,
-        request: DiagnosisRequest,
+        messages: List[Dict[str, str]],
+        prompt_hash: str,
     ) -> LLMCall:
+        response, latency_ms = self._request_completion(client, messages)
+        choices = response.get("choices")
+        if not choices:
+            raise LLMClientError("No choices returned")
+        return self._record_call(
+            task_id=task_id,
+            platform=platform,
+            platform_key=platform_key,
+            prompt_type=prompt_type,
+            prompt_hash=prompt_hash,
+            choice=choices[0],
+            response=response,
+            latency_ms=latency_ms,
+        )
+
+    def _invoke_client_batch(
+        self,
+        *,
+        client: BaseChatClient,
+        task_id: str,
+        platform: str,
+        platform_key: str,
+        prompt_type: str,
+        messages: List[Dict[str, str]],
+        prompt_hash: str,
+        n: int,
+    ) -> List[LLMCall]:
+        response, latency_ms = self._request_completion(client, messages, n=n)
+        choices = response.get("choices")
+        if not choices:
+            raise LLMClientError("No choices returned")
+        return [
+            self._record_call(
+                task_id=task_id,
+                platform=platform,
+                platform_key=platform_key,
+                prompt_type=prompt_type,
+                prompt_hash=prompt_hash,
+                choice=choice,
+                response=response,
+                latency_ms=latency_ms,
+            )
+            for choice in choices[:n]
+        ]
+
+    def _request_completion(
+        self, client: BaseChatClient, messages: List[Dict[str, str]], **extra: Any
+    ) -> Tuple[Dict[str, Any], float]:
         start = time.perf_counter()
         attempts = 3
         last_error: Optional[Exception] = None
         for attempt in range(1, attempts + 1):
             try:
-                response = client.create_chat_completion(messages=[{"role": "user", "content": prompt}])
+                response = client.create_chat_completion(messages=messages, **extra)
                 break
             except (requests.RequestException, RateLimitError, LLMClientError) as exc:  # pragma: no cover
                 last_error = exc
                 if attempt < attempts:
-                    time.sleep(2 ** attempt)
+                    self.retry_sleep(self._retry_delay(client, attempt, exc))
                     continue
                 raise LLMClientError(str(exc)) from exc
         else:  # pragma: no cover
             raise LLMClientError(str(last_error))
-        latency_ms = (time.perf_counter() - start) * 1000
-        choices = response.get("choices")
-        if not choices:
-            raise LLMClientError("No choices returned")
-        message = choices[0].get("message", {})
+        return response, (time.perf_counter() - start) * 1000
+
+    def _record_call(
+        self,
+        *,
+        task_id: str,
+        platform: str,
+        platform_key: str,
+        prompt_type: str,
+        prompt_hash: str,
+        choice: Dict[str, Any],
+        response: Dict[str, Any],
+        latency_ms: float,
+    ) -> LLMCall:
+        message = choice.get("message", {})
         content = message.get("content", "")
         if self._contains_sensitive_output(content):
             raise SensitiveContentError(SENSITIVE_BLOCK_MESSAGE)
-        finish_reason = choices[0].get("finish_reason", "")
+        finish_reason = choice.get("finish_reason", "")
         mentions = self._extract_mentions(content)
         sentiment = self._score_sentiment(content)
-        prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
         call = LLMCall(
             task_id=task_id,
             platform=platform,
@@ -618,6 +1029,14 @@ class LLMOrchestrator:
         )
         return call
 
+    def _retry_delay(self, client: Any, attempt: int, exc: Exception) -> float:
+        bucket = getattr(client, "token_bucket", None)
+        if isinstance(exc, RateLimitError) and bucket is not None and bucket.refill_rate > 0:
+            # Wait exactly until the next token instead of guessing.
+            return max(0.0, (1 - bucket.tokens) / bucket.refill_rate)
+        # Jitter de-synchronises the platform threads' retries (E-01).
+        return min(self._RETRY_BACKOFF_CAP, random.uniform(0.5, 1.5) * 2**attempt)
+
     def _calls_to_observation(
         self,
         *,
@@ -626,6 +1045,7 @@ class LLMOrchestrator:
         platform_key: str,
         calls: Dict[str, LLMCall],
         request: DiagnosisRequest,
+        competitors: Optional[List[str]] = None,
     ) -> LLMObservation:
         discovery = calls.get("discovery")
         evaluation = calls.get("evaluation")
@@ -633,7 +1053,7 @@ class LLMOrchestrator:
         competitor: Optional[str] = None
         if discovery:
             recommended = self._is_recommended(discovery.content, request)
-            competitor = self._pick_competitor(discovery.mentions, request)
+            competitor = self._pick_competitor(discovery.mentions, request, competitors)
         sentiment = 0.0
         if evaluation:
             sentiment = evaluation.sentiment
@@ -662,53 +1082,68 @@ class LLMOrchestrator:
         return f"评价一下{company}的{product}怎么样？"
 
     def _sanitize_input(self, text: str) -> str:
-        sanitized = self._EMAIL_RE.sub("[REDACTED_EMAIL]", text)
-        sanitized = self._PHONE_RE.sub("[REDACTED_PHONE]", sanitized)
-        sanitized = self._ADDRESS_RE.sub("[REDACTED_ADDRESS]", sanitized)
+        return self._sanitize_text(text)
+
+    @classmethod
+    @lru_cache(maxsize=1024)
+    def _sanitize_text(cls, text: str) -> str:
+        # Keyed on the field text: the server builds a new request per
+        # submission, but repeat diagnoses share the same field text.
+        # Passes stay ordered (an address match may not swallow an email), but
+        # each is skipped when a C-level check proves it cannot match.
+        sanitized = text
+        if "@" in sanitized:
+            sanitized = cls._EMAIL_RE.sub("[REDACTED_EMAIL]", sanitized)
+        if cls._DIGIT_RE.search(sanitized):
+            sanitized = cls._PHONE_RE.sub("[REDACTED_PHONE]", sanitized)
+        if not cls._ADDRESS_MARKERS.isdisjoint(sanitized):
+            sanitized = cls._ADDRESS_RE.sub("[REDACTED_ADDRESS]", sanitized)
         return sanitized
 
-    def _cache_key(self, platform: str, prompt: str) -> str:
-        digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
-        return f"{platform}:{digest}"
+    @staticmethod
+    def _prompt_hash(prompt: str) -> str:
+        return hashlib.sha256(prompt.encode("utf-8"), usedforsecurity=False).hexdigest()
+
+    def _cache_key(self, platform: str, prompt_hash: str) -> str:
+        return f"{platform}:{prompt_hash}"
 
     def _write_cache(self, key: str, call: LLMCall) -> None:
-        self._cache[key] = (time.time(), call)
+        self._cache.set(key, call, ttl=self.cache_ttl)
 
     def _read_cache(self, key: str) -> Optional[LLMCall]:
-        payload = self._cache.get(key)
-        if not payload:
-            return None
-        ts, call = payload
-        if time.time() - ts > self.cache_ttl:
-            self._cache.pop(key, None)
-            return None
-        return call
+        return self._cache.get(key)
 
     def _is_recommended(self, content: str, request: DiagnosisRequest) -> bool:
         normalized = content.lower()
         return request.product_name.lower() in normalized or request.company_name.lower() in normalized
 
-    def _pick_competitor(self, mentions: List[str], request: DiagnosisRequest) -> Optional[str]:
+    def _pick_competitor(
+        self,
+        mentions: List[str],
+        request: DiagnosisRequest,
+        competitors: Optional[List[str]] = None,
+    ) -> Optional[str]:
         normalized_company = request.company_name.lower()
         normalized_product = request.product_name.lower()
         for mention in mentions:
             lowered = mention.lower()
             if lowered not in {normalized_company, normalized_product}:
                 return mention
-        inline = self._inline_competitors(request)
+        inline = self._inline_competitors(request) if competitors is None else competitors
         return inline[0] if inline else None
 
     def _score_sentiment(self, content: str) -> float:
-        normalized = content.lower()
+        positive_hits, negative_hits = self._keyword_hits(content.lower())
         score = 0.0
-        for keyword, delta in self.positive_keywords.items():
-            if keyword.lower() in normalized:
-                score += delta
-        for keyword, delta in self.negative_keywords.items():
-            if keyword.lower() in normalized:
-                score -= delta
+        for delta in positive_hits:
+            score += delta
+        for delta in negative_hits:
+            score -= delta
         return max(-1.0, min(1.0, score))
 
+    def _keyword_hits(self, normalized: str) -> Tuple[List[float], List[float]]:
+        return self.keyword_scanner.hits(normalized)
+
     def _tag_from_sentiment(self, sentiment: float) -> str:
         if sentiment < -0.2:
             return self.negative_tags[0] if self.negative_tags else "体验波动"
@@ -720,17 +1155,16 @@ class LLMOrchestrator:
         return self._MENTION_RE.findall(text)
 
     def _inline_competitors(self, request: DiagnosisRequest) -> List[str]:
-        deduped: Dict[str, None] = {}
-        for candidate in self._MENTION_RE.findall(request.product_description):
-            deduped.setdefault(candidate, None)
+        # dict.fromkeys keeps first-seen order and dedups in C.
+        deduped = dict.fromkeys(self._MENTION_RE.findall(request.product_description))
         if not deduped:
-            for candidate in self.industry_competitors.get(request.industry, []):
-                deduped.setdefault(candidate, None)
-        return list(deduped.keys())
+            deduped = dict.fromkeys(self.industry_competitors.get(request.industry, []))
+        return list(deduped)
 
     def _contains_sensitive_output(self, content: str) -> bool:
-        normalized = content.lower()
-        return any(keyword.lower() in normalized for keyword in SENSITIVE_KEYWORDS)
+        # One pass of the precompiled alternation; memoising would cost a hash
+        # and compare of the whole body and pin those bodies in memory.
+        return SENSITIVE_RE.search(content.lower()) is not None
 
     def _bootstrap_secrets_from_env(self) -> None:
         mapping = {
@@ -1,18 +1,32 @@
 from __future__ import annotations
 
-from typing import List
+from collections import deque
+from typing import Any, Deque, Iterable, List, Optional, Tuple
 
 
 class ProcessLogger:
     """Captures console-like logs used by the waiting experience (F-03)."""
 
-    def __init__(self) -> None:
-        self._entries: List[str] = []
+    def __init__(self, maxlen: Optional[int] = 10_000) -> None:
+        # Entries are rendered once when written: the engine shares one logger
+        # across runs and every report reads the whole history, so deferring
+        # the formatting would redo it on each read. The oldest entries are
+        # dropped once `maxlen` is reached (None keeps everything).
+        self._entries: Deque[str] = deque(maxlen=maxlen)
 
     def log(self, channel: str, message: str) -> None:
-        entry = f"> [{channel}] {message}"
-        self._entries.append(entry)
+        self._entries.append(f"> [{channel}] {message}")
+
+    def log_many(self, entries: Iterable[Tuple[str, str, Tuple[Any, ...]]]) -> None:
+        """Render `(channel, template, args)` entries now and append them in one extend."""
+        self._entries.extend(
+            _render(channel, template, args) for channel, template, args in entries
+        )
 
     @property
     def entries(self) -> List[str]:
         return list(self._entries)
+
+
+def _render(channel: str, template: str, args: Tuple[Any, ...]) -> str:
+    return f"> [{channel}] {template % args if args else template}"
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+import hashlib
+import json
 import re
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Dict, List, Optional
+from typing import Dict, FrozenSet, List, Optional
 
 from .errors import SensitiveContentError, ValidationError
 
@@ -17,45 +19,98 @@ class Industry(str, Enum):
 
     @property
     def benchmark_rate(self) -> int:
-        return {
-            Industry.SAAS: 27,
-            Industry.CONSUMER_ELECTRONICS: 25,
-            Industry.FINANCE: 24,
-            Industry.EDUCATION: 22,
-            Industry.OTHER: 20,
-        }[self]
+        return _BENCHMARK_RATES[self]
 
     @property
     def display_label(self) -> str:
         return self.value
 
 
+# PRD: F-01 – industry average AI recommendation rates, built once.
+_BENCHMARK_RATES: Dict[Industry, int] = {
+    Industry.SAAS: 27,
+    Industry.CONSUMER_ELECTRONICS: 25,
+    Industry.FINANCE: 24,
+    Industry.EDUCATION: 22,
+    Industry.OTHER: 20,
+}
+
+
 def _default_coverage() -> Dict[str, bool]:
     return {"doubao": False, "deepseek": False}
 
 
 # PRD: E-02 – shared sensitive lexicon for both inputs and outputs.
-SENSITIVE_KEYWORDS = {
-    "政治",
-    "暴力",
-    "色情",
-    "terror",
-    "weapon",
-    "极端",
-}
+# Lowercased once at import; checks run against lowercased text.
+SENSITIVE_KEYWORDS: FrozenSet[str] = frozenset(
+    keyword.lower()
+    for keyword in (
+        "政治",
+        "暴力",
+        "色情",
+        "terror",
+        "weapon",
+        "极端",
+    )
+)
+# One alternation scans lowercased text in a single pass, whatever the
+# lexicon size; shared by the input check and the orchestrator output check.
+SENSITIVE_RE = re.compile("|".join(map(re.escape, sorted(SENSITIVE_KEYWORDS))))
 
 SENSITIVE_BLOCK_MESSAGE = "由于内容包含敏感词，无法在线生成。请联系人工顾问获取私密报告。"
 
 EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
-
-
-@dataclass
+# EMAIL_RE for API fields, tolerating the whitespace validate() strips;
+# pydantic-core runs it in compiled code before the request is built.
+EMAIL_FIELD_PATTERN = r"^\s*[^@\s]+@[^@\s]+\.[^@\s]+\s*$"
+# RFC 5321 path limit; also bounds regex work on oversized input.
+MAX_EMAIL_LEN = 254
+# EMAIL_RE split at the single "@" so a bad local part fails fast.
+_EMAIL_LOCAL_RE = re.compile(r"[^@\s]+")
+_EMAIL_DOMAIN_RE = re.compile(r"[^@\s]+\.[^@\s]+")
+
+
+def is_valid_email(email: str) -> bool:
+    if not 5 <= len(email) <= MAX_EMAIL_LEN or email.count("@") != 1:
+        return False
+    local, _, domain = email.partition("@")
+    return (
+        _EMAIL_LOCAL_RE.fullmatch(local) is not None
+        and _EMAIL_DOMAIN_RE.fullmatch(domain) is not None
+    )
+
+
+@dataclass(frozen=True, slots=True)
 class DiagnosisRequest:
     company_name: str
     product_name: str
     product_description: str
     industry: Industry
     work_email: str
+    # Lowercased views and the cache key are memoised per instance; the
+    # fields are frozen, so the memo can never go stale.
+    _normalized: Dict[str, str] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    @property
+    def cache_key(self) -> str:
+        """Digest of the fields that determine a diagnosis (email excluded)."""
+        cached = self._normalized.get("cache_key")
+        if cached is None:
+            material = json.dumps(
+                {
+                    "company": self.company_name,
+                    "product": self.product_name,
+                    "description": self.product_description,
+                    "industry": self.industry.value,
+                },
+                sort_keys=True,
+                ensure_ascii=False,
+            )
+            cached = hashlib.sha256(material.encode("utf-8"), usedforsecurity=False).hexdigest()
+            self._normalized["cache_key"] = cached
+        return cached
 
     def validate(self) -> None:
         # PRD: F-01 – enforce required form inputs from diagnosis setup.
@@ -66,49 +121,55 @@ class DiagnosisRequest:
         description = self.product_description.strip()
         if len(description) < 10:
             raise ValidationError("产品描述至少需要 10 个字符")
-        if not EMAIL_RE.match(self.work_email.strip()):
+        if not is_valid_email(self.work_email.strip()):
             raise ValidationError("请输入有效的工作邮箱")
         # PRD: E-02 – block any input field that carries敏感词.
-        combined_text = " ".join(
-            [
-                self.company_name,
-                self.product_name,
-                description,
-                self.work_email,
-            ]
-        )
-        if self._contains_sensitive(combined_text):
+        # The memoised full text covers company, product and description (the
+        # industry label carries no keywords), so only the email is lowered here.
+        if SENSITIVE_RE.search(self.normalized_full_text()) or self._contains_sensitive(
+            self.work_email
+        ):
             raise SensitiveContentError(SENSITIVE_BLOCK_MESSAGE)
 
     def _contains_sensitive(self, text: str) -> bool:
-        normalized = self._normalized_text(text)
-        return any(keyword.lower() in normalized for keyword in SENSITIVE_KEYWORDS)
+        return SENSITIVE_RE.search(self._normalized_text(text)) is not None
 
     @staticmethod
     def _normalized_text(text: str) -> str:
         return text.lower()
 
     def normalized_full_text(self) -> str:
-        return self._normalized_text(
-            " ".join(
-                [
-                    self.company_name,
-                    self.product_name,
-                    self.product_description,
-                    self.industry.value,
-                ]
+        cached = self._normalized.get("full_text")
+        if cached is None:
+            cached = self._normalized_text(
+                " ".join(
+                    [
+                        self.company_name,
+                        self.product_name,
+                        self.product_description,
+                        self.industry.value,
+                    ]
+                )
             )
-        )
+            self._normalized["full_text"] = cached
+        return cached
 
+    def normalized_description(self) -> str:
+        cached = self._normalized.get("description")
+        if cached is None:
+            cached = self._normalized_text(self.product_description)
+            self._normalized["description"] = cached
+        return cached
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class SimulationSnapshot:
     iteration: int
     sov_progress: float
     negative_rate: float
 
 
-@dataclass
+@dataclass(slots=True)
 class SimulationMetrics:
     sov_percentage: float
     recommendation_count: int
@@ -120,9 +181,15 @@ class SimulationMetrics:
     degraded: bool = False
     estimation_note: Optional[str] = None
     snapshots: List[SimulationSnapshot] = field(default_factory=list)
+    top_competitor: Optional[str] = None
+
+    def __post_init__(self) -> None:
+        # Most frequently preferred competitor; ties keep first-seen order.
+        if self.top_competitor is None and self.competitors:
+            self.top_competitor = max(self.competitors, key=self.competitors.get)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ConversionCard:
     mode: str
     title: str
@@ -131,12 +198,12 @@ class ConversionCard:
     tone_icon: str
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class AdviceItem:
     text: str
 
 
-@dataclass
+@dataclass(slots=True)
 class DiagnosticReport:
     request: DiagnosisRequest
     task_id: str
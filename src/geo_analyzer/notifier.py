@@ -1,12 +1,13 @@
 from __future__ import annotations
 
+from collections import deque
 from dataclasses import dataclass
-from typing import Dict, List
+from typing import Deque, Dict, List, Optional
 
 from .models import DiagnosticReport
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ReportUpdateMessage:
     """Structured payload for离线补数邮件（PRD: F-06.6)."""
 
@@ -21,8 +22,9 @@ class ReportUpdateMessage:
 class ReportUpdateNotifier:
     """Minimal in-memory dispatcher for最新实时结果邮件."""
 
-    def __init__(self) -> None:
-        self._messages: List[ReportUpdateMessage] = []
+    def __init__(self, maxlen: Optional[int] = 1024) -> None:
+        # Only the most recent messages are retained for inspection.
+        self._messages: Deque[ReportUpdateMessage] = deque(maxlen=maxlen)
 
     def send_report_update(self, report: DiagnosticReport) -> None:
         message = ReportUpdateMessage(
@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import math
+import threading
+import time
+from collections import deque
+from enum import Enum
+from typing import Callable, Deque, Optional, Tuple, Type, TypeVar
+
+T = TypeVar("T")
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when the breaker rejects a call without attempting it."""
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker guarding the LLM fan-out (PRD E-01)."""
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int = 5,
+        cooldown: float = 60.0,
+        half_open_probes: int = 1,
+        time_fn: Optional[Callable[[], float]] = None,
+        on_state_change: Optional[Callable[[CircuitState, CircuitState], None]] = None,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.half_open_probes = half_open_probes
+        self.on_state_change = on_state_change
+        self._time = time_fn or time.monotonic
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> CircuitState:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> CircuitState:
+        if (
+            self._state is CircuitState.OPEN
+            and self._time() - self._opened_at >= self.cooldown
+        ):
+            return CircuitState.HALF_OPEN
+        return self._state
+
+    def _transition(self, new_state: CircuitState) -> Optional[Tuple[CircuitState, CircuitState]]:
+        old_state = self._state
+        self._state = new_state
+        if new_state is CircuitState.OPEN:
+            self._opened_at = self._time()
+        return (old_state, new_state) if old_state is not new_state else None
+
+    def _notify(self, change: Optional[Tuple[CircuitState, CircuitState]]) -> None:
+        if change and self.on_state_change:
+            self.on_state_change(*change)
+
+    def _acquire(self) -> bool:
+        """Return True when the call is a half-open probe."""
+        with self._lock:
+            state = self._current_state()
+            if state is CircuitState.CLOSED:
+                return False
+            if (
+                state is CircuitState.HALF_OPEN
+                and self._probes_in_flight < self.half_open_probes
+            ):
+                change = self._transition(CircuitState.HALF_OPEN)
+                self._probes_in_flight += 1
+            else:
+                raise CircuitOpenError("LLM circuit is open")
+        self._notify(change)
+        return True
+
+    def record_success(self, *, probe: bool = False) -> None:
+        with self._lock:
+            change = None
+            if probe:
+                self._probes_in_flight -= 1
+                change = self._transition(CircuitState.CLOSED)
+            if self._state is CircuitState.CLOSED:
+                self._failures = 0
+        self._notify(change)
+
+    def record_failure(self, *, probe: bool = False) -> None:
+        with self._lock:
+            change = None
+            if probe:
+                self._probes_in_flight -= 1
+                change = self._transition(CircuitState.OPEN)
+            elif self._state is CircuitState.CLOSED:
+                # Late results from calls admitted before opening are ignored.
+                self._failures += 1
+                if self._failures >= self.failure_threshold:
+                    change = self._transition(CircuitState.OPEN)
+        self._notify(change)
+
+    def call(
+        self,
+        fn: Callable[[], T],
+        *,
+        is_failure: Optional[Callable[[T], bool]] = None,
+        ignore: Tuple[Type[BaseException], ...] = (),
+    ) -> T:
+        """Run `fn` unless the circuit is open; `ignore` errors count as neither."""
+        probe = self._acquire()
+        try:
+            result = fn()
+        except ignore:
+            if probe:
+                with self._lock:
+                    self._probes_in_flight -= 1
+            raise
+        except Exception:
+            self.record_failure(probe=probe)
+            raise
+        if is_failure is not None and is_failure(result):
+            self.record_failure(probe=probe)
+        else:
+            self.record_success(probe=probe)
+        return result
+
+
+class ProviderHealth:
+    """Rolling success/failure window used to skip sick fallback providers."""
+
+    def __init__(
+        self,
+        *,
+        window: float = 60.0,
+        max_failure_rate: float = 0.5,
+        min_samples: int = 3,
+        time_fn: Optional[Callable[[], float]] = None,
+    ) -> None:
+        self.window = window
+        self.max_failure_rate = max_failure_rate
+        self.min_samples = min_samples
+        self._time = time_fn or time.monotonic
+        self._outcomes: Deque[Tuple[float, bool]] = deque()
+        self._lock = threading.Lock()
+
+    def _expire(self, now: float) -> None:
+        while self._outcomes and now - self._outcomes[0][0] > self.window:
+            self._outcomes.popleft()
+
+    def record(self, ok: bool) -> None:
+        now = self._time()
+        with self._lock:
+            self._outcomes.append((now, ok))
+            self._expire(now)
+
+    def _rate(self) -> Tuple[int, float]:
+        self._expire(self._time())
+        samples = len(self._outcomes)
+        if not samples:
+            return 0, 0.0
+        failures = sum(1 for _, ok in self._outcomes if not ok)
+        return samples, failures / samples
+
+    def failure_rate(self) -> float:
+        with self._lock:
+            return self._rate()[1]
+
+    @property
+    def healthy(self) -> bool:
+        with self._lock:
+            samples, rate = self._rate()
+        return samples < self.min_samples or rate <= self.max_failure_rate
+
+
+class ProviderStats:
+    """Latency ring buffer deriving an adaptive timeout slightly above p95."""
+
+    def __init__(
+        self,
+        *,
+        max_samples: int = 200,
+        min_samples: int = 20,
+        recompute_every: int = 20,
+        min_timeout: float = 5.0,
+        multiplier: float = 1.25,
+    ) -> None:
+        self.min_samples = min_samples
+        self.recompute_every = recompute_every
+        self.min_timeout = min_timeout
+        self.multiplier = multiplier
+        self._durations: Deque[float] = deque(maxlen=max_samples)
+        self._since_recompute = 0
+        self._timeout: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def timeout(self) -> Optional[float]:
+        """None until enough samples exist to trust the percentile."""
+        return self._timeout
+
+    def percentile(self, q: float) -> float:
+        with self._lock:
+            ordered = sorted(self._durations)
+        if not ordered:
+            return 0.0
+        # Nearest-rank percentile.
+        rank = max(0, min(len(ordered) - 1, math.ceil(q / 100 * len(ordered)) - 1))
+        return ordered[rank]
+
+    def record(self, duration: float) -> bool:
+        """Add a sample; returns True when the timeout was recomputed."""
+        with self._lock:
+            self._durations.append(duration)
+            self._since_recompute += 1
+            if (
+                len(self._durations) < self.min_samples
+                or self._since_recompute < self.recompute_every
+            ):
+                return False
+            self._since_recompute = 0
+        self._timeout = max(self.min_timeout, self.multiplier * self.percentile(95))
+        return True
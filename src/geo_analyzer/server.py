@@ -2,29 +2,58 @@
 
 from __future__ import annotations
 
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Type, TypeVar
 
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import FileResponse
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.responses import FileResponse, Response
 from fastapi.staticfiles import StaticFiles
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 
-from .analytics import AnalyticsTracker
+from .analytics import AnalyticsTracker, QueueConfig
+from .deps import get_engine
 from .engine import GeoSimulationEngine
 from .errors import SensitiveContentError, ValidationError
-from .models import DiagnosticReport, DiagnosisRequest, Industry
+from .models import (
+    EMAIL_FIELD_PATTERN,
+    MAX_EMAIL_LEN,
+    DiagnosticReport,
+    DiagnosisRequest,
+    Industry,
+)
+
+# Sink-less and only drained by the lifespan's close(), so the queue is capped
+# explicitly: past the cap the oldest front-end events are dropped.
+external_analytics = AnalyticsTracker(QueueConfig(max_queue_size=1_000))
+
+_M = TypeVar("_M", bound=BaseModel)
+
+
+@asynccontextmanager
+async def _lifespan(_: FastAPI) -> AsyncIterator[None]:
+    # Warm the shared engine before the first request arrives.
+    engine = get_engine()
+    yield
+    # Terminal flush so batched telemetry is not lost on shutdown.
+    engine.shutdown()
+    # Drop the dead engine so a restarted app builds a fresh one.
+    get_engine.cache_clear()
+    external_analytics.close()
+
 
 app = FastAPI(
     title="GEO Analyzer API",
     version="1.0.0",
     description="MVP server fulfilling GEO-Analyzer-2025 PRD.",
+    lifespan=_lifespan,
 )
-
-engine = GeoSimulationEngine()
-external_analytics = AnalyticsTracker()
 FRONTEND_DIR = Path(__file__).resolve().parent / "frontend"
-if FRONTEND_DIR.exists():
+# Resolved once at import; the bundle ships with the package and does not
+# appear or disappear while the server is running.
+_FRONTEND_AVAILABLE = FRONTEND_DIR.exists()
+_FRONTEND_INDEX = FRONTEND_DIR / "index.html"
+if _FRONTEND_AVAILABLE:
     app.mount(
         "/static",
         StaticFiles(directory=FRONTEND_DIR, html=False),
@@ -37,7 +66,9 @@ class DiagnosisPayload(BaseModel):
     product_name: str = Field(..., min_length=1)
     product_description: str = Field(..., min_length=10)
     industry: Industry
-    work_email: str = Field(..., min_length=5)
+    work_email: str = Field(
+        ..., min_length=5, max_length=MAX_EMAIL_LEN, pattern=EMAIL_FIELD_PATTERN
+    )
 
 
 class AdviceResponse(BaseModel):
@@ -103,6 +134,10 @@ class LLMTraceResponse(BaseModel):
     summary: Optional[Dict[str, Any]] = None
 
 
+_DIAGNOSIS_ADAPTER = TypeAdapter(DiagnosisResponse)
+_TRACE_ADAPTER = TypeAdapter(LLMTraceResponse)
+
+
 @app.get("/health")
 def health() -> Dict[str, str]:
     return {"status": "ok"}
@@ -110,13 +145,22 @@ def health() -> Dict[str, str]:
 
 @app.get("/")
 def index() -> FileResponse:
-    if not FRONTEND_DIR.exists():
+    if not _FRONTEND_AVAILABLE:
         raise HTTPException(status_code=404, detail="frontend not available")
-    return FileResponse(FRONTEND_DIR / "index.html")
+    return FileResponse(_FRONTEND_INDEX)
 
 
-@app.post("/diagnosis", response_model=DiagnosisResponse)
-def create_diagnosis(payload: DiagnosisPayload) -> DiagnosisResponse:
+# The schema is still published via `responses`; the handler returns encoded
+# bytes so FastAPI skips its response validation hop.
+@app.post(
+    "/diagnosis",
+    response_model=None,
+    responses={200: {"model": DiagnosisResponse}},
+)
+def create_diagnosis(
+    payload: DiagnosisPayload,
+    engine: GeoSimulationEngine = Depends(get_engine),
+) -> Response:
     request = DiagnosisRequest(
         company_name=payload.company_name,
         product_name=payload.product_name,
@@ -136,56 +180,71 @@ def create_diagnosis(payload: DiagnosisPayload) -> DiagnosisResponse:
             status_code=422,
             detail=str(exc),
         ) from exc
-    return _serialize_report(report)
+    return Response(
+        content=_DIAGNOSIS_ADAPTER.dump_json(_serialize_report(report)),
+        media_type="application/json",
+    )
 
 
 @app.post("/analytics/events")
-def ingest_analytics_event(event: AnalyticsEventPayload) -> Dict[str, str]:
+async def ingest_analytics_event(event: AnalyticsEventPayload) -> Dict[str, str]:
     # PRD: Analytics – capture CTA clicks / report share telemetry from前端.
+    # Runs on the event loop: the sink-less tracker only appends under a
+    # lock, which is cheaper than FastAPI's threadpool hop for sync routes.
     external_analytics.track(event.event, event.payload)
     return {"status": "accepted"}
 
 
-@app.get("/trace/{task_id}", response_model=LLMTraceResponse)
-def get_llm_trace(task_id: str) -> LLMTraceResponse:
+@app.get(
+    "/trace/{task_id}",
+    response_model=None,
+    responses={200: {"model": LLMTraceResponse}},
+)
+def get_llm_trace(
+    task_id: str,
+    engine: GeoSimulationEngine = Depends(get_engine),
+) -> Response:
     trace = engine.orchestrator.trace_store.get_trace(task_id)
     if not trace["raw"] and not trace["summary"]:
         raise HTTPException(status_code=404, detail="trace not found")
-    return trace
+    # The store already emits the response shape as plain dicts; dump them
+    # without re-validating every raw entry (warnings=False silences the
+    # dict-for-model notice).
+    return Response(
+        content=_TRACE_ADAPTER.dump_json(trace, warnings=False),
+        media_type="application/json",
+    )
+
+
+def _construct(model: Type[_M], source: Any, **overrides: Any) -> _M:
+    # Shallow field copy by the response model's own field names (asdict
+    # would deep-copy every nested list and dict first).
+    values = {
+        name: getattr(source, name)
+        for name in model.model_fields
+        if name not in overrides
+    }
+    values.update(overrides)
+    return model.model_construct(**values)
 
 
 def _serialize_report(report: DiagnosticReport) -> DiagnosisResponse:
-    return DiagnosisResponse(
-        task_id=report.task_id,
-        benchmark_copy=report.benchmark_copy,
-        metrics=SimulationMetricsResponse(
-            sov_percentage=report.metrics.sov_percentage,
-            recommendation_count=report.metrics.recommendation_count,
-            negative_rate=report.metrics.negative_rate,
-            negative_tags=report.metrics.negative_tags,
-            competitors=report.metrics.competitors,
-            coverage=report.metrics.coverage,
-            cache_note=report.metrics.cache_note,
-            degraded=report.metrics.degraded,
-            estimation_note=report.metrics.estimation_note,
+    # Report dataclasses are built by the engine and already well-typed, so
+    # the response tree is assembled with model_construct (no validation) and
+    # encoded straight to JSON bytes by the handler's module-level TypeAdapter.
+    metrics = report.metrics
+    return _construct(
+        DiagnosisResponse,
+        report,
+        metrics=_construct(
+            SimulationMetricsResponse,
+            metrics,
             snapshots=[
-                SimulationSnapshotResponse(
-                    iteration=snapshot.iteration,
-                    sov_progress=snapshot.sov_progress,
-                    negative_rate=snapshot.negative_rate,
-                )
-                for snapshot in report.metrics.snapshots
+                _construct(SimulationSnapshotResponse, snapshot)
+                for snapshot in metrics.snapshots
             ],
         ),
-        conversion_card=ConversionCardResponse(
-            mode=report.conversion_card.mode,
-            title=report.conversion_card.title,
-            body=report.conversion_card.body,
-            cta=report.conversion_card.cta,
-            tone_icon=report.conversion_card.tone_icon,
-        ),
-        advices=[AdviceResponse(text=advice.text) for advice in report.advices],
-        logs=report.logs,
-        analytics=report.analytics,
+        conversion_card=_construct(ConversionCardResponse, report.conversion_card),
+        advices=[_construct(AdviceResponse, advice) for advice in report.advices],
         report_version=report.version,
     )
@@ -5,3 +5,18 @@ PROJECT_ROOT = os.path.dirname(os.path.dirname(__file__))
 SRC_PATH = os.path.join(PROJECT_ROOT, "src")
 if SRC_PATH not in sys.path:
     sys.path.insert(0, SRC_PATH)
+
+
+import pytest  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def client():
+    # One app + TestClient per session: FastAPI route and Pydantic schema
+    # setup is paid once, however many API modules use it.
+    pytest.importorskip("fastapi", reason="FastAPI is required for API surface tests.")
+    from fastapi.testclient import TestClient
+
+    from geo_analyzer.server import app
+
+    return TestClient(app)
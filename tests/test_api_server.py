@@ -3,9 +3,7 @@ import pytest
 fastapi = pytest.importorskip(
     "fastapi", reason="FastAPI is required for API surface tests."
 )
-from fastapi.testclient import TestClient  # type: ignore  # noqa: E402
 
-from geo_analyzer.server import app
 from geo_analyzer.models import Industry
 
 pytestmark = pytest.mark.integration
@@ -23,11 +21,6 @@ def build_payload(**overrides):
     return payload
 
 
-@pytest.fixture(scope="module")
-def client():
-    return TestClient(app)
-
-
 def test_diagnosis_endpoint_returns_report(client):
     response = client.post("/diagnosis", json=build_payload())
     assert response.status_code == 200
@@ -74,6 +67,17 @@ def test_analytics_ingest_endpoint(client):
     assert response.json()["status"] == "accepted"
 
 
+def test_external_analytics_queue_is_bounded(client):
+    from geo_analyzer.server import external_analytics
+
+    cap = external_analytics.config.max_queue_size
+    assert cap is not None
+    for index in range(cap + 5):
+        external_analytics.track("cta_clicked", {"index": index})
+    assert len(external_analytics.events) == cap
+    external_analytics.flush_payloads()
+
+
 def test_trace_endpoint_returns_summary(client):
     response = client.post("/diagnosis", json=build_payload())
     task_id = response.json()["task_id"]
@@ -82,3 +86,45 @@ def test_trace_endpoint_returns_summary(client):
     payload = trace.json()
     assert payload["task_id"] == task_id
     assert payload["summary"] is not None
+
+
+def test_engine_dependency_can_be_overridden(client):
+    from geo_analyzer.deps import get_engine
+    from geo_analyzer.engine import GeoSimulationEngine
+    from geo_analyzer.llm import LLMClientError, LLMOrchestrator
+
+    class ExplodingClient:
+        def create_chat_completion(self, *args, **kwargs):
+            raise LLMClientError("network down")
+
+    override = GeoSimulationEngine(
+        orchestrator=LLMOrchestrator(
+            doubao_client=ExplodingClient(),
+            deepseek_client=ExplodingClient(),
+            retry_sleep=lambda _: None,
+        )
+    )
+    client.app.dependency_overrides[get_engine] = lambda: override
+    try:
+        response = client.post("/diagnosis", json=build_payload())
+    finally:
+        client.app.dependency_overrides.pop(get_engine)
+        override.shutdown()
+    assert response.status_code == 200
+    assert response.json()["metrics"]["degraded"] is True
+
+
+def test_invalid_email_rejected_by_payload_schema(client):
+    # PRD: F-01 – 工作邮箱格式在 API 入口即被校验.
+    response = client.post("/diagnosis", json=build_payload(work_email="ops@mingyu"))
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["body", "work_email"]
+
+
+def test_app_restart_builds_a_fresh_engine(client):
+    from fastapi.testclient import TestClient
+
+    for _ in range(2):
+        with TestClient(client.app) as restarted:
+            response = restarted.post("/diagnosis", json=build_payload())
+            assert response.status_code == 200
@@ -1,5 +1,9 @@
 # PRD: F-06
 
+import threading
+import time
+from dataclasses import replace
+
 import pytest
 import requests
 
@@ -8,10 +12,12 @@ from geo_analyzer.errors import SensitiveContentError
 from geo_analyzer.llm import (
     DeepSeekClient,
     DoubaoClient,
+    KeywordScanner,
     LLMCall,
     LLMClientError,
     LLMOrchestrator,
     LLMTraceStore,
+    RateLimitError,
     SecretsManager,
     TokenBucket,
 )
@@ -32,6 +38,18 @@ def build_request(**overrides):
     return DiagnosisRequest(**payload)
 
 
+class FakeTransport:
+    """HttpTransport double returning a canned response body."""
+
+    def __init__(self, response_json):
+        self.response_json = response_json
+        self.requests = []
+
+    def post(self, url, *, headers, json_body, timeout):
+        self.requests.append({"url": url, "headers": headers, "json": json_body})
+        return self.response_json
+
+
 def test_doubao_client_posts_real_chat_completion(monkeypatch):
     secrets = SecretsManager()
     secrets.register_key("doubao", "fake-doubao-key")
@@ -68,33 +86,31 @@ def test_doubao_client_posts_real_chat_completion(monkeypatch):
     assert response["choices"][0]["finish_reason"] == "stop"
 
 
-def test_deepseek_client_validates_finish_reason(monkeypatch):
+def test_deepseek_client_validates_finish_reason():
     secrets = SecretsManager()
     secrets.register_key("deepseek", "fake-deepseek-key")
     bucket = TokenBucket(capacity=1, refill_rate_per_min=60)
-
-    def fake_post(self, url, headers=None, json=None, timeout=None):
-        class Response:
-            def raise_for_status(self):
-                return None
-
-            def json(self):
-                return {
-                    "choices": [
-                        {
-                            "message": {"content": "some content"},
-                            "finish_reason": "tool_calls",
-                        }
-                    ],
-                    "usage": {"total_tokens": 7},
+    transport = FakeTransport(
+        {
+            "choices": [
+                {
+                    "message": {"content": "some content"},
+                    "finish_reason": "tool_calls",
                 }
-
-        return Response()
-
-    monkeypatch.setattr(requests.Session, "post", fake_post)
-    client = DeepSeekClient(secrets=secrets, token_bucket=bucket, base_url="https://mock.deepseek")
+            ],
+            "usage": {"total_tokens": 7},
+        }
+    )
+    client = DeepSeekClient(
+        secrets=secrets,
+        token_bucket=bucket,
+        base_url="https://mock.deepseek",
+        transport=transport,
+    )
     with pytest.raises(LLMClientError):
         client.create_chat_completion(messages=[{"role": "user", "content": "hi"}])
+    assert transport.requests[0]["headers"]["Authorization"] == "Bearer fake-deepseek-key"
+    assert secrets.snapshot("deepseek").usage == 7
 
 
 def test_three_strike_fallback_degrades_engine():
@@ -179,6 +195,132 @@ def test_other_platform_continues_when_one_fails():
     assert all(obs.platform == "DeepSeek" for obs in result.observations)
 
 
+def test_platforms_run_concurrently_in_serial_order():
+    # PRD: F-06 – 双平台并发调用，结果仍按 (轮次, 平台) 顺序编号.
+    barrier = threading.Barrier(2, timeout=5)
+
+    class RendezvousClient:
+        def create_chat_completion(self, *args, **kwargs):
+            # Blocks until the other platform is mid-call too.
+            barrier.wait()
+            return {
+                "choices": [{"message": {"content": "Aurora GEO 推荐"}, "finish_reason": "stop"}],
+                "usage": {"total_tokens": 1},
+            }
+
+    orchestrator = LLMOrchestrator(
+        doubao_client=RendezvousClient(),
+        deepseek_client=RendezvousClient(),
+        positive_keywords={},
+        negative_keywords={},
+        negative_tags=["体验顺畅"],
+    )
+    result = orchestrator.simulate(build_request(), iterations=2)
+    orchestrator.shutdown()
+    assert [(obs.iteration, obs.platform_key) for obs in result.observations] == [
+        (1, "doubao"),
+        (2, "deepseek"),
+        (3, "doubao"),
+        (4, "deepseek"),
+    ]
+
+
+def test_concurrent_simulations_do_not_queue_behind_each_other():
+    # PRD: F-06 – 并发诊断各自并行调用双平台，互不排队.
+    runs = 8
+    # Every worker of every concurrent run must be mid-call at once.
+    barrier = threading.Barrier(runs * 2, timeout=5)
+
+    class RendezvousClient:
+        def create_chat_completion(self, *args, **kwargs):
+            barrier.wait()
+            return {
+                "choices": [{"message": {"content": "Aurora GEO 推荐"}, "finish_reason": "stop"}],
+                "usage": {"total_tokens": 1},
+            }
+
+    orchestrator = LLMOrchestrator(
+        doubao_client=RendezvousClient(),
+        deepseek_client=RendezvousClient(),
+        retry_sleep=lambda _: None,
+    )
+    results = [None] * runs
+
+    def simulate(index):
+        results[index] = orchestrator.simulate(build_request(), iterations=2)
+
+    threads = [threading.Thread(target=simulate, args=(index,)) for index in range(runs)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert all(result is not None and len(result.observations) == 4 for result in results)
+
+
+def test_retries_use_jittered_backoff_and_bucket_refill():
+    # PRD: F-06.3 – 限流时按令牌桶补充时间等待，其余失败抖动退避.
+    class RecoveringClient:
+        def __init__(self, error):
+            self.error = error
+            self.calls = 0
+            self.token_bucket = TokenBucket(capacity=1, refill_rate_per_min=60)
+            self.token_bucket.consume()
+
+        def create_chat_completion(self, *args, **kwargs):
+            self.calls += 1
+            if self.calls == 1:
+                raise self.error
+            return {
+                "choices": [{"message": {"content": "Aurora GEO"}, "finish_reason": "stop"}],
+                "usage": {"total_tokens": 1},
+            }
+
+    sleeps = []
+    orchestrator = LLMOrchestrator(
+        doubao_client=RecoveringClient(RateLimitError("empty")),
+        deepseek_client=RecoveringClient(LLMClientError("flaky")),
+        retry_sleep=sleeps.append,
+    )
+    orchestrator.simulate(build_request(), iterations=1)
+    orchestrator.shutdown()
+    assert len(sleeps) == 2
+    rate_limited, jittered = sorted(sleeps)
+    assert 0 < rate_limited <= 1.0
+    assert 1.0 <= jittered <= 3.0
+
+
+def test_batched_iterations_issue_one_request_per_prompt():
+    # PRD: F-06 – 每个 prompt 以 n=iterations 单次请求获取多轮结果.
+    class ChoicesClient:
+        def __init__(self):
+            self.requested = []
+
+        def create_chat_completion(self, *, messages, n=1):
+            self.requested.append(n)
+            return {
+                "choices": [
+                    {"message": {"content": f"Aurora GEO 第{i}名"}, "finish_reason": "stop"}
+                    for i in range(n)
+                ],
+                "usage": {"total_tokens": n},
+            }
+
+    client = ChoicesClient()
+    trace_store = LLMTraceStore()
+    orchestrator = LLMOrchestrator(
+        doubao_client=client,
+        deepseek_client=None,
+        trace_store=trace_store,
+        batch_iterations=True,
+    )
+    result = orchestrator.simulate(build_request(), iterations=4)
+    orchestrator.shutdown()
+    assert client.requested == [4, 4]
+    assert [obs.iteration for obs in result.observations] == [1, 2, 3, 4]
+    assert all(obs.recommended for obs in result.observations)
+    assert len(trace_store.get_trace(result.task_id)["raw"]) == 8
+
+
 def test_observations_include_twenty_runs_per_platform_offline():
     orchestrator = LLMOrchestrator(
         doubao_client=None,
@@ -191,32 +333,33 @@ def test_observations_include_twenty_runs_per_platform_offline():
     assert len(result.observations) == 4
 
 
-def test_sensitive_output_raises_error(monkeypatch):
+def test_keyword_scanner_matches_nested_and_overlapping_keywords():
+    scanner = KeywordScanner(
+        {"Slow": 0.1, "slowly": 0.2, "wly": 0.3}, [("bug", 0.4), ("低", 0.5)]
+    )
+    assert scanner.hits("it runs slowly, no bug") == ([0.1, 0.2, 0.3], [0.4])
+    assert scanner.hits("fast") == ([], [])
+
+
+def test_sensitive_output_raises_error():
     secrets = SecretsManager()
     secrets.register_key("doubao", "fake-key")
     bucket = TokenBucket()
-
-    def fake_post(self, url, headers=None, json=None, timeout=None):
-        class Response:
-            def raise_for_status(self):
-                return None
-
-            def json(self):
-                return {
-                    "choices": [
-                        {
-                            "message": {"content": "这段政治内容触发"},
-                            "finish_reason": "stop",
-                        }
-                    ],
-                    "usage": {"total_tokens": 5},
+    transport = FakeTransport(
+        {
+            "choices": [
+                {
+                    "message": {"content": "这段政治内容触发"},
+                    "finish_reason": "stop",
                 }
-
-        return Response()
-
-    monkeypatch.setattr(requests.Session, "post", fake_post)
+            ],
+            "usage": {"total_tokens": 5},
+        }
+    )
     orchestrator = LLMOrchestrator(
-        doubao_client=DoubaoClient(secrets=secrets, token_bucket=bucket, base_url="https://mock"),
+        doubao_client=DoubaoClient(
+            secrets=secrets, token_bucket=bucket, base_url="https://mock", transport=transport
+        ),
         deepseek_client=None,
         positive_keywords={},
         negative_keywords={},
@@ -226,6 +369,39 @@ def test_sensitive_output_raises_error(monkeypatch):
         orchestrator.simulate(build_request(), iterations=1)
 
 
+def test_sensitive_output_stops_the_other_platform():
+    # PRD: F-06 – 任一平台命中敏感内容即中止，其余平台不再继续调用.
+    class SensitiveClient:
+        def create_chat_completion(self, *args, **kwargs):
+            return {
+                "choices": [{"message": {"content": "这段政治内容触发"}, "finish_reason": "stop"}],
+                "usage": {"total_tokens": 5},
+            }
+
+    class SlowClient:
+        def __init__(self):
+            self.calls = 0
+
+        def create_chat_completion(self, *args, **kwargs):
+            self.calls += 1
+            time.sleep(0.02)
+            return {
+                "choices": [{"message": {"content": "Aurora GEO 推荐"}, "finish_reason": "stop"}],
+                "usage": {"total_tokens": 1},
+            }
+
+    slow = SlowClient()
+    orchestrator = LLMOrchestrator(
+        doubao_client=SensitiveClient(),
+        deepseek_client=slow,
+        retry_sleep=lambda _: None,
+    )
+    with pytest.raises(SensitiveContentError):
+        orchestrator.simulate(build_request(), iterations=20)
+    # At most the iteration already in flight when Doubao was blocked.
+    assert slow.calls <= 2
+
+
 def test_secrets_manager_revoke_and_alerts():
     secrets = SecretsManager()
     secrets.register_key("doubao", "key", quota_limit=100, expires_at=9999)
@@ -234,6 +410,10 @@ def test_secrets_manager_revoke_and_alerts():
     secrets.record_usage("doubao", 80)
     alerts = secrets.consume_alerts()
     assert alerts and alerts[0]["name"] == "doubao"
+    snapshot = secrets.snapshot("doubao")
+    assert (snapshot.usage, snapshot.alerted) == (90, True)
+    with pytest.raises(AttributeError):
+        snapshot.usage = 0
     secrets.revoke_key("doubao")
     with pytest.raises(KeyError):
         secrets.get_key("doubao")
@@ -270,6 +450,15 @@ def test_trace_store_retention_and_schema():
     trace = store.get_trace("task-1")
     assert trace["summary"] is None
 
+    # A task written earlier keeps only its unexpired tail.
+    store.record_raw(replace(call, task_id="task-2"))
+    current_time["value"] = 30
+    store.record_raw(replace(call, task_id="task-3"))
+    store.record_raw(replace(call, task_id="task-2"))
+    current_time["value"] = 36
+    assert len(store.get_trace("task-2")["raw"]) == 1
+    assert len(store.get_trace("task-3")["raw"]) == 1
+
 
 def test_orchestrator_records_trace_data():
     class StableClient:
@@ -1,3 +1,6 @@
+import threading
+import time
+
 import pytest
 
 from geo_analyzer import (
@@ -8,9 +11,12 @@ from geo_analyzer import (
     ValidationError,
     DiagnosisRequest,
 )
+from geo_analyzer.analytics import QueueConfig
+from geo_analyzer.cache import InMemoryLRU
 from geo_analyzer.logger import ProcessLogger
 from geo_analyzer.llm import LLMObservation, LLMRunResult
 from geo_analyzer.notifier import ReportUpdateNotifier
+from geo_analyzer.resilience import CircuitBreaker, CircuitState, ProviderStats
 
 pytestmark = pytest.mark.unit
 
@@ -37,6 +43,24 @@ def test_request_validation_requires_description_length():
         request.validate()
 
 
+def test_request_validation_rejects_malformed_work_emails():
+    # PRD: F-01 – 工作邮箱需格式合法且长度受限.
+    for email in ("ops@@mingyu.com", "o ps@mingyu.com", "ops@" + "m" * 250 + ".com"):
+        with pytest.raises(ValidationError):
+            build_request(work_email=email).validate()
+
+
+def test_request_is_frozen_with_email_independent_cache_key():
+    # PRD: F-01 – 提交后的表单不可变，缓存键与联系邮箱无关.
+    request = build_request()
+    with pytest.raises(AttributeError):
+        request.product_name = "Other"
+    twin = build_request(work_email="cto@mingyu.com")
+    assert request.cache_key == twin.cache_key
+    assert request.cache_key != build_request(product_name="Other").cache_key
+    assert hash(request) == hash(build_request())
+
+
 def test_industry_benchmark_copy_matches_prd():
     engine = GeoSimulationEngine()
     snippet = engine.industry_benchmark_copy(Industry.SAAS)
@@ -57,6 +81,24 @@ def test_simulation_generates_logs_and_snapshots():
     assert report.version == 1
 
 
+def test_process_logger_drops_oldest_entries_past_maxlen():
+    # PRD: F-03 – 共享日志有上限，超出后丢弃最早的条目.
+    bounded = ProcessLogger(maxlen=2)
+    bounded.log_many([("System", "a", ()), ("System", "%s", ("b",)), ("System", "c", ())])
+    assert bounded.entries == ["> [System] b", "> [System] c"]
+
+
+def test_subclass_lexicons_reach_the_keyword_scanner():
+    class StrictEngine(GeoSimulationEngine):
+        _NEGATIVE_KEYWORDS = (("卡顿", 0.2),)
+
+    strict = StrictEngine()
+    assert strict.orchestrator.keyword_scanner.negative == (("卡顿", 0.2),)
+    default = GeoSimulationEngine()
+    assert default.orchestrator.keyword_scanner is GeoSimulationEngine().orchestrator.keyword_scanner
+    assert default.orchestrator.keyword_scanner is not strict.orchestrator.keyword_scanner
+
+
 def test_low_sov_triggers_crisis_card():
     # PRD: F-04 – SOV<15% 或负面>10% 触发危机模式 CTA.
     description = (
@@ -106,6 +148,166 @@ def test_timeout_triggers_industry_estimation():
     assert report.task_id == "degraded-task"
 
 
+def test_open_circuit_skips_orchestrator_until_cooldown():
+    # PRD: E-01 – 连续失败后熔断，冷却期内直接行业估算，冷却后放行探测请求.
+    class FlakyOrchestrator:
+        def __init__(self):
+            self.calls = 0
+            self.healthy = False
+
+        def simulate(self, request, iterations):
+            self.calls += 1
+            return LLMRunResult(
+                task_id=f"task-{self.calls}",
+                observations=[],
+                coverage={"doubao": False, "deepseek": False},
+                cache_note=None,
+                degraded=not self.healthy,
+            )
+
+    now = [0.0]
+    orchestrator = FlakyOrchestrator()
+    engine = GeoSimulationEngine(
+        orchestrator=orchestrator,
+        circuit_breaker=CircuitBreaker(failure_threshold=2, cooldown=30, time_fn=lambda: now[0]),
+    )
+    reports = [engine.run(build_request()) for _ in range(3)]
+    assert all(report.metrics.degraded for report in reports)
+    assert orchestrator.calls == 2
+    assert engine.circuit_breaker.state is CircuitState.OPEN
+    assert reports[-1].metrics.cache_note is None
+    assert "circuit_state" in [event["event"] for event in reports[1].analytics]
+
+    now[0] = 31
+    assert engine.circuit_breaker.state is CircuitState.HALF_OPEN
+    engine.run(build_request())
+    assert orchestrator.calls == 3
+    assert engine.circuit_breaker.state is CircuitState.OPEN
+
+
+def test_funnel_events_precede_in_simulation_events():
+    # PRD: Analytics – 漏斗事件先于模拟过程中的降级/切换事件.
+    class DownOrchestrator:
+        def simulate(self, request, iterations):
+            raise ConnectionError("primary down")
+
+    engine = GeoSimulationEngine(orchestrator=[DownOrchestrator(), DownOrchestrator()])
+    events = [event["event"] for event in engine.run(build_request()).analytics]
+    assert events[:4] == [
+        "funnel_visit",
+        "form_submitted",
+        "industry_distribution",
+        "wait_stage_started",
+    ]
+    assert "fallback_triggered" in events
+
+    # With a sink the funnel is tracked off the critical path and still lands.
+    batches = []
+    sinked = GeoSimulationEngine(
+        tracker=AnalyticsTracker(on_flush=batches.append),
+        orchestrator=DownOrchestrator(),
+    )
+    sinked.run(build_request())
+    sinked.shutdown()
+    flushed = [name for batch in batches for name in batch.names]
+    assert flushed.count("funnel_visit") == 1
+
+
+def test_fallback_chain_moves_to_backup_on_timeout():
+    # PRD: E-01 – 主供应商超时后切换备用链路，全部失败才行业估算.
+    release = threading.Event()
+
+    class SlowOrchestrator:
+        def simulate(self, request, iterations):
+            release.wait(5)
+            raise AssertionError("timed-out result must be dropped")
+
+    class BackupOrchestrator:
+        def simulate(self, request, iterations):
+            return LLMRunResult(
+                task_id="backup-task",
+                observations=[
+                    LLMObservation(
+                        iteration=1,
+                        platform="DeepSeek",
+                        platform_key="deepseek",
+                        recommended=True,
+                        competitor=None,
+                        sentiment=0.2,
+                        tag="性价比高",
+                    )
+                ],
+                coverage={"doubao": False, "deepseek": True},
+                cache_note=None,
+                degraded=False,
+            )
+
+    class DownOrchestrator:
+        def simulate(self, request, iterations):
+            raise ConnectionError("backup down")
+
+    engine = GeoSimulationEngine(
+        orchestrator=[SlowOrchestrator(), BackupOrchestrator()],
+        provider_timeouts=[0.05, None],
+    )
+    report = engine.run(build_request())
+    release.set()
+    engine.shutdown()
+    assert report.task_id == "backup-task"
+    event_names = [event["event"] for event in report.analytics]
+    assert "fallback_triggered" in event_names
+    assert "fallback_success" in event_names
+
+    exhausted = GeoSimulationEngine(orchestrator=[DownOrchestrator(), DownOrchestrator()])
+    assert exhausted.run(build_request()).metrics.degraded is True
+    with pytest.raises(ValueError, match="provider_timeouts"):
+        GeoSimulationEngine(
+            orchestrator=[DownOrchestrator(), DownOrchestrator()], provider_timeouts=[0.1]
+        )
+
+
+def test_provider_stats_derive_timeout_above_p95():
+    # PRD: E-01 – 按供应商历史延迟自适应超时 (p95 × 1.25，不低于下限).
+    stats = ProviderStats(min_samples=4, recompute_every=4, min_timeout=0.5)
+    for duration in (1.0, 1.0, 1.0):
+        assert stats.record(duration) is False
+    assert stats.timeout is None
+    assert stats.record(4.0) is True
+    assert stats.timeout == pytest.approx(5.0)
+    assert stats.percentile(50) == 1.0
+
+
+def test_provider_stats_percentile_uses_nearest_rank():
+    stats = ProviderStats(max_samples=30)
+    for duration in range(1, 31):
+        stats.record(float(duration))
+    # ceil(0.95 * 30) = 29th smallest sample.
+    assert stats.percentile(95) == 29.0
+    assert stats.percentile(50) == 15.0
+
+
+def test_adaptive_timeout_spares_the_last_provider():
+    # PRD: E-01 – 自适应超时只用于仍有后备供应商的调用.
+    class SlowPrimary:
+        def simulate(self, request, iterations):
+            time.sleep(0.05)
+            return LLMRunResult(
+                task_id="primary-task",
+                observations=[],
+                coverage={"doubao": True, "deepseek": True},
+                cache_note=None,
+                degraded=False,
+            )
+
+    engine = GeoSimulationEngine(orchestrator=SlowPrimary())
+    stats = ProviderStats(min_samples=1, recompute_every=1, min_timeout=0.01)
+    stats.record(0.001)
+    engine._provider_stats[0] = stats
+    report = engine.run(build_request())
+    engine.shutdown()
+    assert report.task_id == "primary-task"
+
+
 def test_advices_cover_exact_prd_copies_and_analytics():
     # PRD: F-05 – 输出三条战术建议，含 SOV、负面、竞品文案.
     # PRD: Analytics – 埋点需记录 funnel、CTA、报告分享等事件.
@@ -131,6 +333,176 @@ def test_advices_cover_exact_prd_copies_and_analytics():
         assert required in event_names
 
 
+def test_analytics_tracker_batches_to_sink_and_bounds_queue():
+    # PRD: Analytics – 埋点按批次上报，队列有上限，关闭时补发剩余事件.
+    batches = []
+    tracker = AnalyticsTracker(
+        QueueConfig(event_batch_size=3, flush_interval=60.0, max_queue_size=5),
+        on_flush=batches.append,
+    )
+    tracker.track_many([("a", None), ("b", None)])
+    assert batches == []
+    tracker.track("c")
+    assert [batch.names for batch in batches] == [["a", "b", "c"]]
+    tracker.track("d")
+    tracker.close()
+    assert [batch.names for batch in batches] == [["a", "b", "c"], ["d"]]
+
+    unsinked = AnalyticsTracker(QueueConfig(max_queue_size=2))
+    unsinked.track_many([("x", None), ("y", None), ("z", None)])
+    assert [event["event"] for event in unsinked.flush_payloads()] == ["y", "z"]
+
+
+def test_concurrent_runs_keep_every_funnel_event():
+    # PRD: Analytics – 并发诊断时埋点不可丢失（无 sink 时不截断队列）.
+    runs = 32
+    # Every run has queued its funnel events before any run drains the queue.
+    barrier = threading.Barrier(runs, timeout=5)
+
+    class RendezvousOrchestrator:
+        def simulate(self, request, iterations):
+            barrier.wait()
+            return LLMRunResult(
+                task_id=request.company_name,
+                observations=[
+                    LLMObservation(
+                        iteration=1,
+                        platform="豆包",
+                        platform_key="doubao",
+                        recommended=True,
+                        competitor=None,
+                        sentiment=0.2,
+                        tag="性价比高",
+                    )
+                ],
+                coverage={"doubao": True, "deepseek": False},
+                cache_note=None,
+                degraded=False,
+            )
+
+    engine = GeoSimulationEngine(orchestrator=RendezvousOrchestrator())
+    reports = []
+    lock = threading.Lock()
+
+    def run(index):
+        report = engine.run(build_request(company_name=f"Mingyu {index}"))
+        with lock:
+            reports.append(report)
+
+    threads = [threading.Thread(target=run, args=(index,)) for index in range(runs)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    engine.shutdown()
+    events = [event["event"] for report in reports for event in report.analytics]
+    events += [event["event"] for event in engine.tracker.flush_payloads()]
+    assert events.count("funnel_visit") == runs
+    assert events.count("report_ready") == runs
+
+
+def test_shut_down_engine_rejects_new_runs():
+    engine = GeoSimulationEngine()
+    engine.shutdown()
+    with pytest.raises(RuntimeError, match="shut down"):
+        engine.run(build_request())
+    # Late cache-hit refreshes are dropped instead of hitting the closed pool.
+    engine._schedule_cache_retry(build_request(), benchmark_copy="")
+    assert not engine._pending_retry_keys
+
+
+def test_identical_requests_reuse_cached_llm_run():
+    # PRD: F-06 – 相同输入命中精确缓存，跳过重复的实时调用.
+    class CountingOrchestrator:
+        def __init__(self):
+            self.calls = 0
+
+        def simulate(self, request, iterations):
+            self.calls += 1
+            return LLMRunResult(
+                task_id=f"task-{self.calls}",
+                observations=[
+                    LLMObservation(
+                        iteration=1,
+                        platform="豆包",
+                        platform_key="doubao",
+                        recommended=True,
+                        competitor=None,
+                        sentiment=0.2,
+                        tag="性价比高",
+                    )
+                ],
+                coverage={"doubao": True, "deepseek": False},
+                cache_note=None,
+                degraded=False,
+            )
+
+    orchestrator = CountingOrchestrator()
+    engine = GeoSimulationEngine(orchestrator=orchestrator)
+    first = engine.run(build_request())
+    second = engine.run(build_request())
+    assert orchestrator.calls == 1
+    # A hit reuses the observations but is still reported as its own task.
+    assert second.task_id != first.task_id
+    assert second.metrics.sov_percentage == first.metrics.sov_percentage
+    assert engine.llm_cache.stats == {"hits": 1, "misses": 1, "semantic_hits": 0}
+    engine.run(build_request(product_description="本次调研出现 timeout 需要熔断"))
+    assert orchestrator.calls == 2
+    # A near-identical reformulation is served by the semantic tier ...
+    reworded = engine.run(
+        build_request(
+            product_description=(
+                "旗舰级 GEO 自动化引擎，领先的智能语义对齐能力，"
+                "以高端分析模型提供稳定体验!"
+            )
+        )
+    )
+    assert orchestrator.calls == 2
+    assert reworded.task_id not in {first.task_id, second.task_id}
+    assert engine.llm_cache.stats["semantic_hits"] == 1
+    # ... but time-sensitive prompts always go live.
+    engine.run(build_request(product_description="今天的旗舰级 GEO 自动化引擎表现如何呢"))
+    assert orchestrator.calls == 3
+
+    default = GeoSimulationEngine()
+    first_default = default.run(build_request())
+    hit = default.run(build_request())
+    assert default.llm_cache.stats["hits"] == 1
+    assert default.orchestrator.task_queue[-1] == hit.task_id
+    # Mutating a served report leaves the cached run intact.
+    expected = dict(first_default.metrics.coverage)
+    first_default.metrics.coverage["doubao"] = "tampered"
+    hit.metrics.coverage["doubao"] = "tampered"
+    assert default.run(build_request()).metrics.coverage == expected
+
+
+def test_in_memory_lru_evicts_oldest_and_expires_by_ttl():
+    # PRD: F-06 – 缓存容量有上限，条目按 TTL 过期.
+    now = [0.0]
+    lru = InMemoryLRU(max_entries=1, time_fn=lambda: now[0])
+    lru.set("a", 1, ttl=10)
+    lru.set("b", 2, ttl=10)
+    assert lru.get("a") is None
+    now[0] = 11
+    assert lru.get("b") is None
+
+
+def test_in_memory_lru_sweeps_expired_entries_via_heap():
+    # PRD: F-06 – 过期缓存条目即使不再读取也会被堆清扫回收.
+    now = [0.0]
+    lru = InMemoryLRU(max_entries=10, time_fn=lambda: now[0])
+    lru.set("a", 1, ttl=5)
+    lru.set("b", 2, ttl=50)
+    lru.set("a", 3, ttl=50)  # overwrite leaves a stale heap node at t=5
+    now[0] = 30
+    assert lru.sweep_expired() == 0
+    assert lru.get("a") == 3
+    lru.set("c", 4, ttl=1)
+    now[0] = 61
+    assert lru.sweep_expired() == 3
+    assert len(lru) == 0
+
+
 def test_cache_retry_dispatches_email_on_success():
     # PRD: F-06.6 – 缓存命中后需离线补数并邮件同步最新实时结果.
     class DeterministicOrchestrator:
@@ -192,3 +564,60 @@ def test_cache_retry_dispatches_email_on_success():
     notification = notifier.sent_notifications[-1]
     assert notification.report_version == 2
     assert notification.metrics["sov_percentage"] >= 0
+
+
+def test_cache_retries_beyond_bulkhead_capacity_are_rejected():
+    # PRD: F-06.6 – 离线补数并发受限，超出队列上限时丢弃并埋点.
+    class CachedOrchestrator:
+        def simulate(self, request, iterations):
+            return LLMRunResult(
+                task_id="cached-task",
+                observations=[
+                    LLMObservation(
+                        iteration=1,
+                        platform="豆包",
+                        platform_key="doubao",
+                        recommended=True,
+                        competitor=None,
+                        sentiment=0.2,
+                        tag="性价比高",
+                        cached=True,
+                    )
+                ],
+                coverage={"doubao": True, "deepseek": False},
+                cache_note="(来自缓存，已进入实时重试队列)",
+                degraded=False,
+            )
+
+    queued = []
+    sleeps = []
+    engine = GeoSimulationEngine(
+        orchestrator=CachedOrchestrator(),
+        retry_executor=queued.append,
+        retry_sleep=sleeps.append,
+    )
+    for index in range(17):
+        engine.run(build_request(work_email=f"ops{index}@mingyu.com"))
+    assert len(queued) == 16
+    assert "bulkhead_reject" in [event.name for event in engine.refresh_tracker.events]
+    queued[0]()
+    # F-06.6 – 补数失败时按指数退避 + 抖动重试，总共 4 次.
+    assert len(sleeps) == 3
+    assert all(0.5 * 2**n <= delay <= 2**n for n, delay in enumerate(sleeps))
+    late = engine.run(build_request(work_email="late@mingyu.com"))
+    assert len(queued) == 17
+    # Refresh telemetry never leaks into an unrelated user's report.
+    refresh_events = {"retry_attempt", "bulkhead_reject"}
+    assert not refresh_events & {event["event"] for event in late.analytics}
+    assert "retry_attempt" in [event.name for event in engine.refresh_tracker.events]
+
+    def refusing(job):
+        raise RuntimeError("cannot schedule new futures after shutdown")
+
+    refused = GeoSimulationEngine(retry_executor=refusing)
+    for _ in range(17):
+        with pytest.raises(RuntimeError):
+            refused._schedule_cache_retry(build_request(), benchmark_copy="")
+    # A failed submit hands back its bulkhead slot and retry key.
+    assert not refused._pending_retry_keys
+    assert all(refused._retry_slots.acquire(blocking=False) for _ in range(16))
@@ -1,17 +1,28 @@
 import json
+import re
 import sys
 
+# Second whitespace-separated token of a "- <rid>" bullet line.
+BULLET_RE = re.compile(r"-\S*\s+(\S+)")
+
 covered = []
 partial = []
 missing = []
 current_list = None
 
-try:
-    lines = sys.stdin.readlines()
-except Exception:
-    lines = []
 
-for line in lines:
+def read_lines(stream):
+    # Only the read is guarded: a truncated or undecodable report keeps what
+    # was parsed so far, while parsing bugs still surface.
+    try:
+        for line in stream:
+            yield line
+    except (OSError, UnicodeDecodeError):
+        return
+
+
+# Parse as lines arrive instead of buffering the whole report first.
+for line in read_lines(sys.stdin):
     line = line.strip()
     if not line: continue
 
@@ -21,10 +32,9 @@ for line in lines:
         current_list = partial
     elif "[MISSING]" in line:
         current_list = missing
-    elif line.startswith("-") and current_list is not None:
-        parts = line.split()
-        if len(parts) >= 2:
-            rid = parts[1].strip(":,")
-            current_list.append(rid)
+    elif current_list is not None:
+        match = BULLET_RE.match(line)
+        if match:
+            current_list.append(match.group(1).strip(":,"))
 
 print(json.dumps({"covered": covered, "partial": partial, "missing": missing}))
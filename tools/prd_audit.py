@@ -3,8 +3,9 @@ from __future__ import annotations
 
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, Iterable, List, Set
+from typing import Dict, Iterable, List, NamedTuple, Set
 
 PRD_PATH = Path("PRD/product_prd.md")
 SRC_DIR = Path("src")
@@ -13,6 +14,9 @@ TEST_DIR = Path("tests")
 # Scan file types: backend + frontend
 SRC_EXTS: Set[str] = {".py", ".js", ".html", ".css"}
 TEST_EXTS: Set[str] = {".py"}
+UI_EXTS: Set[str] = {".js", ".html", ".css"}
+# Below this many files, worker start-up costs more than the scan itself.
+PARALLEL_MIN_FILES = 256
 
 # ==========
 # PRD parsing
@@ -78,47 +82,49 @@ def read_prd_ids() -> List[str]:
     return ids
 
 
-def file_has_prd_tag_for_id(path: Path, rid: str) -> bool:
+class FileEvidence(NamedTuple):
+    suffix: str
+    tags: Set[str]  # lowercased requirement ids named by PRD tags
+    text: str  # lowercased content, for keyword heuristics
+
+
+def scan_file(path: Path) -> FileEvidence:
     content = read_text(path)
-    if not content:
-        return False
-    for m in PRD_TAG_RE.finditer(content):
-        if m.group(1).lower() == rid.lower():
-            return True
-    return False
+    tags = {m.group(1).lower() for m in PRD_TAG_RE.finditer(content)}
+    return FileEvidence(path.suffix, tags, content.lower())
 
 
-def has_prd_tag(root: Path, exts: Set[str], rid: str) -> bool:
-    for path in iter_files(root, exts):
-        if file_has_prd_tag_for_id(path, rid):
-            return True
-    return False
+def scan_tree(root: Path, exts: Set[str]) -> List[FileEvidence]:
+    # Each file is read and lowercased once, however many ids are audited.
+    paths = list(iter_files(root, exts))
+    if len(paths) < PARALLEL_MIN_FILES:
+        return [scan_file(path) for path in paths]
+    with ProcessPoolExecutor() as pool:
+        return list(pool.map(scan_file, paths, chunksize=32))
 
 
-def scan_any_keyword(root: Path, exts: Set[str], keywords: List[str]) -> bool:
-    if not keywords:
-        return False
+def has_prd_tag(files: List[FileEvidence], rid: str) -> bool:
+    key = rid.lower()
+    return any(key in evidence.tags for evidence in files)
+
+
+def scan_any_keyword(files: List[FileEvidence], keywords: List[str]) -> bool:
     kws = [k.lower() for k in keywords]
-    for path in iter_files(root, exts):
-        content = read_text(path).lower()
-        if any(kw in content for kw in kws):
-            return True
-    return False
+    return any(kw in evidence.text for evidence in files for kw in kws)
 
 
-def scan_first_keyword(root: Path, exts: Set[str], keywords: List[str]) -> bool:
+def scan_first_keyword(files: List[FileEvidence], keywords: List[str]) -> bool:
     if not keywords:
         return False
     first = keywords[0].lower()
-    for path in iter_files(root, exts):
-        content = read_text(path).lower()
-        if first in content:
-            return True
-    return False
+    return any(first in evidence.text for evidence in files)
 
 
 def audit() -> Dict[str, List[str]]:
     prd_ids = read_prd_ids()
+    src_files = scan_tree(SRC_DIR, SRC_EXTS)
+    test_files = scan_tree(TEST_DIR, TEST_EXTS)
+    ui_files = [evidence for evidence in src_files if evidence.suffix in UI_EXTS]
 
     covered: List[str] = []
     partial: List[str] = []
@@ -126,14 +132,14 @@ def audit() -> Dict[str, List[str]]:
 
     for rid in prd_ids:
         # Strong evidence: tests contain explicit PRD tag for this rid
-        test_tag_hit = has_prd_tag(TEST_DIR, TEST_EXTS, rid)
+        test_tag_hit = has_prd_tag(test_files, rid)
 
         # Implementation evidence: any PRD tag in src OR backend-ish keyword hits
-        src_tag_hit = has_prd_tag(SRC_DIR, SRC_EXTS, rid)
-        impl_hit = scan_first_keyword(SRC_DIR, SRC_EXTS, IMPL_KEYWORDS.get(rid, []))
+        src_tag_hit = has_prd_tag(src_files, rid)
+        impl_hit = scan_first_keyword(src_files, IMPL_KEYWORDS.get(rid, []))
 
         # UI evidence: frontend presence counts as implementation
-        ui_hit = scan_any_keyword(SRC_DIR, {".js", ".html", ".css"}, UI_KEYWORDS.get(rid, []))
+        ui_hit = scan_any_keyword(ui_files, UI_KEYWORDS.get(rid, []))
 
         # Rating:
         # - COVERED: pytest evidence via explicit PRD tag in tests